@@ -0,0 +1,52 @@
+"""Measures the cold import time of tweeterpy (what every fresh worker process pays). No network access needed.
+
+Each statement runs in a fresh interpreter with `python -X importtime`, the median of the runs is reported along with the slowest modules (interpreter startup, i.e. site, is not included in the elapsed time).
+
+Usage: python benchmarks/bench_import.py [--runs 10] [--top 10]
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = ["import tweeterpy",
+              "from tweeterpy import TweeterPy",
+              "from tweeterpy import TweeterPy; import curl_cffi, bs4, x_client_transaction"]
+
+
+def measure(statement):
+    """Returns the elapsed seconds of the statement and {module: cumulative_microseconds}, measured in a fresh interpreter."""
+    code = f"import time\nstarted_at = time.perf_counter()\n{statement}\nprint(time.perf_counter() - started_at)"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT_DIRECTORY,
+                            capture_output=True, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        # Nested imports are indented, keep the outermost (largest) timing.
+        timings[module.strip()] = max(int(cumulative), timings.get(module.strip(), 0))
+    return float(result.stdout.strip().splitlines()[-1]), timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        runs = [measure(statement) for _ in range(args.runs)]
+        elapsed_times = [elapsed * 1000 for elapsed, _ in runs]
+        print(f"{statement} : {statistics.median(elapsed_times):.1f}ms median of {args.runs} runs (min {min(elapsed_times):.1f}ms)")
+        _, timings = runs[-1]
+        for module, cumulative in sorted(timings.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {cumulative / 1000:8.1f}ms  {module}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Measures the auth state check cost in a tight lookup loop. No network access needed.
+
+Usage: python benchmarks/bench_logged_in.py
+"""
+import os
+import sys
+import timeit
+import curl_cffi
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tweeterpy import TweeterPy
+from tweeterpy.utils.request import RequestClient
+
+COOKIES_COUNT = 50
+LOOKUPS = 100000
+
+
+def create_session():
+    session = curl_cffi.Session(impersonate="chrome")
+    for count in range(COOKIES_COUNT):
+        session.cookies.set(f"cookie_{count}", "value", domain=".x.com")
+    session.cookies.set("auth_token", "auth_token_here", domain=".x.com")
+    return session
+
+
+def main():
+    # Skip __init__ to avoid the network bootstrap.
+    twitter = TweeterPy.__new__(TweeterPy)
+    twitter.request_client = RequestClient(session=create_session())
+    session = twitter.session
+
+    cookie_jar_walk = timeit.timeit(lambda: "auth_token" in session.cookies.keys(), number=LOOKUPS)
+    cached_state = timeit.timeit(twitter.logged_in, number=LOOKUPS)
+    print(f"{LOOKUPS} lookups, {COOKIES_COUNT + 1} cookies")
+    print(f"cookie jar walk : {cookie_jar_walk:.4f}s ({cookie_jar_walk / LOOKUPS * 1e6:.2f}us per call)")
+    print(f"cached state    : {cached_state:.4f}s ({cached_state / LOOKUPS * 1e6:.2f}us per call)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmarks tweeterpy offline, against the local mock X server (benchmarks/mock_x.py) replaying the fixtures. No network access needed.
+
+Scenarios: startup (session bootstrap + API update), ApiUpdater, pagination, find_nested_key, User/Tweet parsing and concurrent crawling.
+The median of the runs is reported. --latency simulates the network round trip of every request, --rate-limit the x-rate-limit-* headers.
+
+Usage: python benchmarks/bench_offline.py [--runs 5] [--latency 0.0] [--rate-limit N] [--fixtures DIRECTORY] [--json]
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import contextlib
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_x import MockXServer, FIXTURES_DIRECTORY
+from tweeterpy import TweeterPy, util
+from tweeterpy.updater import ApiUpdater
+from tweeterpy.conversation import ConversationCrawler
+
+# Match benchmarks/fixtures/generate_fixtures.py
+USER_ID = "44196397"
+SCREEN_NAME = "benchmark_user"
+FIRST_TWEET_ID = 2006492000000000000
+USER_TWEETS_TOTAL = 60
+
+
+def find_fixture_body(server, operation, cursor=None):
+    return json.loads(server.fixtures[("GET", operation, cursor)][0]["body"])
+
+
+def create_scenarios(server):
+    twitter = TweeterPy(log_level="WARNING")
+    user_tweets_page = find_fixture_body(server, "UserTweets")
+
+    def startup():
+        TweeterPy(log_level="WARNING")
+
+    def api_updater():
+        ApiUpdater(request_client=twitter.request_client, restore_cache=False)
+
+    def pagination():
+        tweets = twitter.get_user_tweets(USER_ID, total=USER_TWEETS_TOTAL)
+        assert len(tweets["data"]) == USER_TWEETS_TOTAL, len(tweets["data"])
+
+    def find_nested_key():
+        util.find_nested_key(user_tweets_page, "tweet_results")
+
+    def parsing():
+        for tweet in util.find_nested_key(user_tweets_page, "tweet_results"):
+            util.Tweet(tweet)
+        for user in util.find_nested_key(user_tweets_page, "user_results"):
+            util.User(user)
+
+    def concurrent_crawling():
+        ConversationCrawler(twitter, max_workers=8).crawl(FIRST_TWEET_ID)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(twitter.get_user_data, [SCREEN_NAME] * 16))
+
+    return {"startup": startup, "api_updater": api_updater, "pagination": pagination, "find_nested_key": find_nested_key,
+            "parsing": parsing, "concurrent_crawling": concurrent_crawling}
+
+
+def measure(function, runs):
+    timings = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started_at)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--rate-limit", type=int, default=None, help="Requests allowed per operation before 429.")
+    parser.add_argument("--fixtures", default=FIXTURES_DIRECTORY)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    results = {}
+    # ApiUpdater saves the API data into the temp directory, don't overwrite the real backup file with the mock data.
+    with tempfile.TemporaryDirectory() as temp_directory:
+        tempfile.tempdir = temp_directory
+        # The pagination progress is printed to stdout, keep it out of the results.
+        with MockXServer(args.fixtures, latency=args.latency, rate_limit=args.rate_limit) as server, server.patch_urls(), \
+                contextlib.redirect_stdout(sys.stderr):
+            for name, function in create_scenarios(server).items():
+                server.reset()
+                timings = [timing * 1000 for timing in measure(function, args.runs)]
+                results[name] = {"median_ms": round(statistics.median(timings), 3), "min_ms": round(min(timings), 3),
+                                 "requests": sum(server.request_counts.values())}
+        tempfile.tempdir = None
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"latency={args.latency}s rate_limit={args.rate_limit} runs={args.runs}")
+    for name, result in results.items():
+        print(f"{name:20} {result['median_ms']:10.2f}ms median  {result['min_ms']:10.2f}ms min  {result['requests']:5} requests")
+
+
+if __name__ == "__main__":
+    main()
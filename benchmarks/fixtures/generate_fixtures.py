@@ -0,0 +1,192 @@
+"""Generates the deterministic fixtures served by the mock X server (benchmarks/mock_x.py), in the RequestRecorder format.
+
+Real responses can be recorded into a directory with tweeterpy.utils.recorder.RequestRecorder and served the same way.
+
+Usage: python benchmarks/fixtures/generate_fixtures.py [--pages 3] [--page-size 20]
+"""
+import os
+import sys
+import json
+import base64
+import random
+import shutil
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from tweeterpy.constants import Path
+from tweeterpy.utils.metrics import get_operation_name
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "x")
+# Newest tweet id of the generated timelines. (2026-01-01)
+FIRST_TWEET_ID = 2006492000000000000
+USER_ID = "44196397"
+SCREEN_NAME = "benchmark_user"
+GUEST_TOKEN = "1900000000000000000"
+FEATURE_SWITCHES = ["responsive_web_graphql_timeline_navigation_enabled", "view_counts_everywhere_api_enabled",
+                    "longform_notetweets_consumption_enabled", "freedom_of_speech_not_reach_fetch_enabled"]
+ONDEMAND_FILE_INDEX = "20113"
+ONDEMAND_FILE_HASH = "7f3a9c1d"
+API_FILE_HASH = "5c2e8b4a"
+MAIN_FILE_HASH = "9e1f6d3b"
+
+
+def create_fixture(method, url, body, operation=None, cursor=None, content_type="application/json; charset=utf-8"):
+    return {"method": method, "url": url, "operation": operation or get_operation_name(url), "cursor": cursor,
+            "status_code": 200, "content_type": content_type, "body": body if isinstance(body, str) else json.dumps(body)}
+
+
+def create_home_page(rng):
+    key = base64.b64encode(bytes(rng.randrange(256) for _ in range(48))).decode()
+    frames = []
+    for frame_index in range(4):
+        rows = ["C".join(" ".join(str(rng.randrange(256)) for _ in range(11)) for _ in range(16))]
+        frames.append(f'<svg id="loading-x-anim-{frame_index}"><g><path d="M 10,30 C 0 0 0"></path>'
+                      f'<path d="M 10,30 C{rows[0]}"></path></g></svg>')
+    feature_switches = {"defaultConfig": {feature: {"value": True} for feature in FEATURE_SWITCHES}, "user": {"config": {}}}
+    initial_state = json.dumps({"featureSwitch": feature_switches, "settings": {}}, separators=(",", ":"))
+    return ("<!DOCTYPE html><html><head>"
+            f'<meta name="twitter-site-verification" content="{key}"/>'
+            f'<script>document.cookie="gt={GUEST_TOKEN}; Max-Age=10800; Domain=.x.com; Path=/; Secure";</script>'
+            f'<script>window.__INITIAL_STATE__={initial_state};window.__META_DATA__={{}};</script>'
+            f'<script>chunks={{0:"main",{ONDEMAND_FILE_INDEX}:"ondemand.s"}};hashes={{1:"0",{ONDEMAND_FILE_INDEX}:"{ONDEMAND_FILE_HASH}"}};'
+            f'files={{api:"{API_FILE_HASH}",vendor:"0"}};</script>'
+            f'<script src="https://abs.twimg.com/responsive-web/client-web/main.{MAIN_FILE_HASH}.js"></script>'
+            f'</head><body>{"".join(frames)}</body></html>')
+
+
+def create_ondemand_file():
+    return ('"use strict";(self.webpackChunk=self.webpackChunk||[]).push([["ondemand.s"],{1:(e,t,n)=>{'
+            'const r=[parseInt(o[2], 16),parseInt(o[12], 16),parseInt(o[14], 16),parseInt(o[7], 16)];}}]);')
+
+
+def create_api_file(operations):
+    modules = []
+    for index, operation in enumerate(operations):
+        features = ",".join(f'"{feature}"' for feature in FEATURE_SWITCHES)
+        modules.append(f'{index}:e=>{{e.exports={{queryId:"bench{index:04d}",operationName:"{operation}",operationType:"query",'
+                       f'metadata:{{featureSwitches:[{features}],fieldToggles:[]}}}}}},')
+    return f'"use strict";(self.webpackChunk=self.webpackChunk||[]).push([["api"],{{{"".join(modules)}}}]);'
+
+
+def create_user(user_index=0):
+    user_id = str(int(USER_ID) + user_index)
+    screen_name = SCREEN_NAME if not user_index else f"{SCREEN_NAME}_{user_index}"
+    return {"__typename": "User", "id": base64.b64encode(f"User:{user_id}".encode()).decode(), "rest_id": user_id,
+            "is_blue_verified": True, "profile_image_shape": "Circle",
+            "legacy": {"created_at": "Tue Jun 02 20:12:29 +0000 2009", "default_profile": False, "default_profile_image": False,
+                       "description": "Benchmark account", "entities": {"description": {"urls": []}}, "fast_followers_count": 0,
+                       "favourites_count": 1200, "followers_count": 1000000 - user_index, "friends_count": 500, "has_custom_timelines": True,
+                       "is_translator": False, "listed_count": 100, "location": "Offline", "media_count": 300, "name": f"Benchmark {user_index}",
+                       "normal_followers_count": 1000000, "pinned_tweet_ids_str": [], "possibly_sensitive": False,
+                       "profile_banner_url": f"https://pbs.twimg.com/profile_banners/{user_id}/1", "profile_image_url_https": f"https://pbs.twimg.com/profile_images/{user_id}/a_normal.jpg",
+                       "profile_interstitial_type": "", "screen_name": screen_name, "statuses_count": 20000, "translator_type": "none",
+                       "verified": False, "withheld_in_countries": []}}
+
+
+def create_tweet(tweet_id, user_index=0, in_reply_to=None):
+    user = create_user(user_index)
+    legacy = {"bookmark_count": 1, "bookmarked": False, "created_at": "Thu Jan 01 00:00:00 +0000 2026", "conversation_id_str": str(in_reply_to or tweet_id),
+              "display_text_range": [0, 64], "entities": {"hashtags": [{"indices": [0, 10], "text": "benchmark"}], "symbols": [], "urls": [], "user_mentions": []},
+              "extended_entities": {"media": [{"id_str": str(tweet_id + 1), "media_key": f"3_{tweet_id + 1}", "type": "photo",
+                                               "media_url_https": f"https://pbs.twimg.com/media/{tweet_id}.jpg"}]},
+              "favorite_count": tweet_id % 1000, "favorited": False, "full_text": f"#benchmark tweet {tweet_id} " + "lorem ipsum " * 4,
+              "is_quote_status": False, "lang": "en", "possibly_sensitive": False, "quote_count": 1, "reply_count": 2, "retweet_count": 3,
+              "retweeted": False, "user_id_str": user["rest_id"], "id_str": str(tweet_id)}
+    if in_reply_to:
+        legacy.update({"in_reply_to_status_id_str": str(in_reply_to), "in_reply_to_screen_name": SCREEN_NAME, "in_reply_to_user_id_str": USER_ID})
+    return {"__typename": "Tweet", "rest_id": str(tweet_id), "core": {"user_results": {"result": user}},
+            "views": {"count": "12345", "state": "EnabledWithCount"}, "source": "<a href=\"https://x.com\">Web App</a>",
+            "is_translatable": False, "legacy": legacy}
+
+
+def create_tweet_entry(tweet_id, **kwargs):
+    return {"entryId": f"tweet-{tweet_id}", "sortIndex": str(tweet_id),
+            "content": {"entryType": "TimelineTimelineItem", "__typename": "TimelineTimelineItem",
+                        "itemContent": {"itemType": "TimelineTweet", "__typename": "TimelineTweet",
+                                        "tweet_results": {"result": create_tweet(tweet_id, **kwargs)}, "tweetDisplayType": "Tweet"}}}
+
+
+def create_cursor_entry(cursor_type, value):
+    return {"entryId": f"cursor-{cursor_type.lower()}-{value}", "sortIndex": "0",
+            "content": {"entryType": "TimelineTimelineCursor", "__typename": "TimelineTimelineCursor", "value": value, "cursorType": cursor_type}}
+
+
+def create_user_tweets_pages(pages, page_size):
+    fixtures = []
+    url = f"https://x.com/i/api/graphql/{Path.USER_TWEETS_ENDPOINT}"
+    for page in range(pages + 1):
+        cursor = f"user-tweets-{page}" if page else None
+        first_tweet_id = FIRST_TWEET_ID - page * page_size * 1000
+        entries = [create_tweet_entry(first_tweet_id - index * 1000) for index in range(page_size)] if page < pages else []
+        entries = [create_cursor_entry("Top", f"user-tweets-top-{page}")] + entries + [create_cursor_entry("Bottom", f"user-tweets-{page + 1}")]
+        instructions = [{"type": "TimelineClearCache"}, {"type": "TimelineAddEntries", "entries": entries}]
+        body = {"data": {"user": {"result": {"__typename": "User", "timeline": {"timeline": {"instructions": instructions}}}}}}
+        fixtures.append(create_fixture("GET", url, body, operation="UserTweets", cursor=cursor))
+    return fixtures
+
+
+def create_conversation_pages(page_size):
+    """Root tweet with page_size reply modules, each with a "show more replies" cursor expanding page_size more replies."""
+    fixtures = []
+    url = f"https://x.com/i/api/graphql/{Path.TWEET_DETAILS_ENDPOINT}"
+    root_id = FIRST_TWEET_ID
+
+    def create_module(reply_id, cursor=None, replies=1):
+        items = [{"entryId": f"conversationthread-{reply_id}-tweet-{reply_id + index}",
+                  "item": {"itemContent": {"itemType": "TimelineTweet", "tweet_results": {"result": create_tweet(reply_id + index, user_index=index + 1, in_reply_to=root_id)}}}}
+                 for index in range(replies)]
+        if cursor:
+            items.append({"entryId": f"conversationthread-{reply_id}-cursor-showmore-{cursor}",
+                          "item": {"itemContent": {"itemType": "TimelineTimelineCursor", "cursorType": "ShowMore", "value": cursor}}})
+        return {"entryId": f"conversationthread-{reply_id}", "content": {"entryType": "TimelineTimelineModule", "items": items}}
+
+    entries = [create_tweet_entry(root_id)]
+    entries.extend(create_module(root_id + (index + 1) * 1000, cursor=f"show-more-{index}") for index in range(page_size))
+    instructions = [{"type": "TimelineAddEntries", "entries": entries}]
+    fixtures.append(create_fixture("GET", url, {"data": {"threaded_conversation_with_injections_v2": {"instructions": instructions}}},
+                                   operation="TweetDetail"))
+    for index in range(page_size):
+        reply_id = root_id + (index + 1) * 1000 + 100
+        instructions = [{"type": "TimelineAddToModule", "moduleEntryId": f"conversationthread-{reply_id}",
+                         "moduleItems": create_module(reply_id, replies=5)["content"]["items"]}]
+        fixtures.append(create_fixture("GET", url, {"data": {"threaded_conversation_with_injections_v2": {"instructions": instructions}}},
+                                       operation="TweetDetail", cursor=f"show-more-{index}"))
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--directory", default=FIXTURES_DIRECTORY)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    operations = sorted({value.split("/")[-1] for key, value in vars(Path).items() if key.endswith(("_ENDPOINT", "_BY_ID"))})
+    fixtures = [create_fixture("GET", "https://x.com/", create_home_page(rng), content_type="text/html; charset=utf-8"),
+                create_fixture("GET", f"https://abs.twimg.com/responsive-web/client-web/ondemand.s.{ONDEMAND_FILE_HASH}a.js",
+                               create_ondemand_file(), content_type="application/javascript"),
+                create_fixture("GET", f"https://abs.twimg.com/responsive-web/client-web/api.{API_FILE_HASH}a.js",
+                               create_api_file(operations), content_type="application/javascript"),
+                create_fixture("GET", f"https://abs.twimg.com/responsive-web/client-web/main.{MAIN_FILE_HASH}.js",
+                               '"use strict";(self.webpackChunk=self.webpackChunk||[]).push([["main"],{}]);', content_type="application/javascript"),
+                create_fixture("POST", "https://api.x.com/1.1/guest/activate.json", {"guest_token": GUEST_TOKEN}),
+                create_fixture("GET", f"https://x.com/i/api/graphql/{Path.USER_DATA_ENDPOINT}", {"data": {"user": {"result": create_user()}}},
+                               operation="UserByScreenName"),
+                create_fixture("GET", f"https://x.com/i/api/graphql/{Path.TWEET_DETAILS_BY_ID}", {"data": {"tweetResult": {"result": create_tweet(FIRST_TWEET_ID)}}},
+                               operation="TweetResultByRestId")]
+    fixtures.extend(create_user_tweets_pages(args.pages, args.page_size))
+    fixtures.extend(create_conversation_pages(args.page_size))
+
+    shutil.rmtree(args.directory, ignore_errors=True)
+    os.makedirs(args.directory)
+    for count, fixture in enumerate(fixtures, start=1):
+        name = fixture["operation"].strip("/").replace("/", "_").replace(".", "_") or "root"
+        with open(os.path.join(args.directory, f"{count:04d}-{name}.json"), "w", encoding="utf-8") as file:
+            json.dump(fixture, file)
+    print(f"{len(fixtures)} fixtures written to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""A local mock X server replaying recorded fixtures (see tweeterpy.utils.recorder and benchmarks/fixtures), for offline benchmarks.
+
+Usage: python benchmarks/mock_x.py [FIXTURES_DIRECTORY]
+
+    with MockXServer("benchmarks/fixtures/x", latency=0.05) as server, server.patch_urls():
+        twitter = TweeterPy()
+        twitter.get_user_tweets("44196397", total=60)
+"""
+import os
+import sys
+import json
+import time
+import random
+import threading
+import contextlib
+from collections import Counter
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tweeterpy.constants import Path
+from tweeterpy.utils.metrics import get_operation_name
+from tweeterpy.utils.recorder import load_fixtures, get_request_cursor
+
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "x")
+
+
+class MockXServer:
+    """Serves the fixtures of a directory by (method, operation, cursor), with an optional latency and rate limit per operation."""
+
+    def __init__(self, fixtures_directory=FIXTURES_DIRECTORY, latency=0.0, jitter=0.0, rate_limit=None, host="127.0.0.1", port=0):
+        """
+        Args:
+            fixtures_directory (str, optional): Directory of the recorded/generated fixtures. Defaults to benchmarks/fixtures/x.
+            latency (float, optional): Seconds to wait before every response. Defaults to 0.0.
+            jitter (float, optional): Random extra seconds (0 to jitter) added to the latency. Defaults to 0.0.
+            rate_limit (int, optional): Requests allowed per operation before returning 429, sent in the x-rate-limit-* headers. If None, no rate limit. Defaults to None.
+            host (str, optional): Defaults to "127.0.0.1".
+            port (int, optional): 0 picks a free port. Defaults to 0.
+        """
+        self.fixtures = load_fixtures(fixtures_directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.request_counts = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def find_fixture(self, method, url):
+        operation = get_operation_name(url)
+        cursor = get_request_cursor(url)
+        for key in ((method, operation, cursor), (method, operation, None)):
+            if key in self.fixtures:
+                return self.fixtures[key][0]
+        # i.e. a fixture recorded with GET but requested with POST.
+        return next((fixtures[0] for (_, fixture_operation, fixture_cursor), fixtures in self.fixtures.items()
+                     if fixture_operation == operation and fixture_cursor in (cursor, None)), None)
+
+    def _create_handler(self):
+        server = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, avoid the Nagle/delayed ACK stalls on the kept alive connections.
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                content_length = int(self.headers.get("Content-Length") or 0)
+                if content_length:
+                    self.rfile.read(content_length)
+                self._respond("POST")
+
+            def _respond(self, method):
+                if server.latency or server.jitter:
+                    time.sleep(server.latency + random.uniform(0, server.jitter))
+                operation = get_operation_name(self.path)
+                with server._lock:
+                    server.request_counts[operation] += 1
+                    count = server.request_counts[operation]
+                headers = {}
+                if server.rate_limit is not None:
+                    headers = {"x-rate-limit-limit": str(server.rate_limit),
+                               "x-rate-limit-remaining": str(max(server.rate_limit - count, 0)),
+                               "x-rate-limit-reset": str(int(time.time()) + 900)}
+                fixture = server.find_fixture(method, self.path)
+                if server.rate_limit is not None and count > server.rate_limit:
+                    self._send(429, json.dumps({"errors": [{"code": 88, "message": "Rate limit exceeded."}]}), headers=headers)
+                elif fixture is None:
+                    self._send(404, json.dumps({"errors": [{"code": 34, "message": "Sorry, that page does not exist."}]}))
+                else:
+                    self._send(fixture["status_code"], fixture["body"], fixture["content_type"], headers)
+
+            def _send(self, status_code, body, content_type="application/json; charset=utf-8", headers=None):
+                body = body.encode("utf-8")
+                self.send_response(status_code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return RequestHandler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.request_counts.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextlib.contextmanager
+    def patch_urls(self):
+        """Points tweeterpy (Path urls) and x_client_transaction (ondemand file url) to this server, restored on exit."""
+        import x_client_transaction.utils
+        base_url = self.base_url
+        urls = {"DOMAIN": urlparse(base_url).netloc, "BASE_URL": f"{base_url}/", "API_URL": f"{base_url}/graphql/",
+                "TASK_URL": f"{base_url}/1.1/onboarding/task.json", "GUEST_TOKEN_URL": f"{base_url}/1.1/guest/activate.json",
+                "TWITTER_CDN": f"{base_url}/responsive-web/client-web", "HOME_TIMELINE_GUEST_URL": f"{base_url}/i/api/2/guide.json",
+                "X_MIGRATE_URL": f"{base_url}/x/migrate"}
+        original_urls = {name: getattr(Path, name) for name in urls}
+        original_ondemand_file_url = x_client_transaction.utils.ON_DEMAND_FILE_URL
+        try:
+            for name, url in urls.items():
+                setattr(Path, name, url)
+            x_client_transaction.utils.ON_DEMAND_FILE_URL = f"{base_url}/responsive-web/client-web/ondemand.s.{{filename}}a.js"
+            yield self
+        finally:
+            for name, url in original_urls.items():
+                setattr(Path, name, url)
+            x_client_transaction.utils.ON_DEMAND_FILE_URL = original_ondemand_file_url
+
+
+if __name__ == "__main__":
+    with MockXServer(sys.argv[1] if len(sys.argv) > 1 else FIXTURES_DIRECTORY) as mock_server:
+        print(f"Serving {sum(map(len, mock_server.fixtures.values()))} fixtures on {mock_server.base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
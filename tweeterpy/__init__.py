@@ -1 +1,9 @@
-from .tweeterpy import TweeterPy
+__all__ = ["TweeterPy"]
+
+
+def __getattr__(name):
+    # TweeterPy is imported on first access, so importing a submodule (i.e. tweeterpy.util) doesn't pull in the whole client.
+    if name == "TweeterPy":
+        from .tweeterpy import TweeterPy
+        return TweeterPy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,123 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tweeterpy import util
+from tweeterpy.login import TaskHandler
+from tweeterpy.guest import bootstrap_session
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _raise_code_required(username, task_id, message):
+    # Default code_callback of the bulk logins, a worker thread must never block on input().
+    raise Exception(f"{username} : verification code required ({task_id}). {message}".strip())
+
+
+class BulkLogin:
+    """
+        Non-interactive login of many accounts : each account gets its own bootstrapped guest session (cookie jar, client transaction and proxy), the login flows run concurrently and the sessions are saved in bulk into a SessionStore.
+        2FA codes are generated from the MFA secrets, the other verification codes (ACID etc) come from a code_callback.
+    """
+
+    def __init__(self, store=None, max_workers=8, proxies=None, hooks=None, code_callback=None, save_batch_size=50, skip_saved=True):
+        """
+        Args:
+            store (SessionStore, optional): Store of the logged in sessions (tweeterpy.utils.session.SessionStore). If None, the sessions are only returned. Defaults to None.
+            max_workers (int, optional): Number of login flows run concurrently. Defaults to 8.
+            proxies (dict/list, optional): Proxies to use, a list of proxies is assigned to the accounts in turn. An account's own "proxies" take precedence. Format {"http":"proxy_here","https":"proxy_here"}. Defaults to None.
+            hooks (list, optional): Request hooks (i.e. tweeterpy.utils.metrics.MetricsAggregator) shared by the login sessions. Defaults to None.
+            code_callback (callable, optional): code_callback(username, task_id, message) returns an out-of-band verification code (i.e. read from the account's email). It's called from the worker threads. If None, the accounts asking for a code fail. Defaults to None.
+            save_batch_size (int, optional): The logged in sessions are saved every save_batch_size logins (single transaction), so an interrupted run keeps its progress. Defaults to 50.
+            skip_saved (bool, optional): Skip the accounts already saved in the store, i.e. to resume an interrupted run. Defaults to True.
+        """
+        self.store = store
+        self.max_workers = max_workers
+        self.proxies = proxies
+        self.hooks = list(hooks or [])
+        self.code_callback = code_callback or _raise_code_required
+        self.save_batch_size = save_batch_size
+        self.skip_saved = skip_saved
+
+    def _get_proxies(self, index, account):
+        proxies = account.get("proxies")
+        if proxies is None:
+            proxies = self.proxies[index % len(self.proxies)] if isinstance(self.proxies, (list, tuple)) and self.proxies else self.proxies
+        if proxies and isinstance(proxies, str):
+            proxies = {'http': proxies, 'https': proxies}
+        return proxies
+
+    @staticmethod
+    def get_session_name(account):
+        return account.get("session_name") or account.get("username") or account.get("email")
+
+    def login_account(self, account, proxies=None):
+        """Logs into a single account on a new guest session.
+
+        Args:
+            account (dict): username, password and optionally email, phone, mfa_secret, session_name and proxies.
+            proxies (dict, optional): Proxies of the session. Defaults to None.
+
+        Returns:
+            RequestClient: RequestClient of the logged in session.
+        """
+        request_client = bootstrap_session(proxies=proxies, hooks=list(self.hooks))
+        TaskHandler(request_client=request_client, code_callback=self.code_callback).login(
+            account.get("username"), account.get("password"), email=account.get("email"), phone=account.get("phone"), mfa_secret=account.get("mfa_secret"))
+        request_client.refresh_auth_state()
+        if not request_client.logged_in:
+            raise Exception(f"{self.get_session_name(account)} : the login flow finished without an auth_token.")
+        util.generate_headers(session=request_client.session)
+        return request_client
+
+    def _save(self, sessions, results):
+        if self.store is None or not sessions:
+            return
+        try:
+            self.store.save_many(sessions)
+        except Exception as error:
+            # Keep going, the sessions are still returned (results["sessions"]) and can be saved again.
+            logger.error(f"Couldn't save {len(sessions)} sessions. {error}")
+            results["unsaved"].extend(sessions)
+
+    def login(self, accounts):
+        """Logs into the accounts concurrently and saves the sessions into the store.
+
+        Args:
+            accounts (list): List of accounts (dict), see login_account.
+
+        Returns:
+            dict: Returns sessions ({session_name: Session}), failed ({session_name: error}), skipped (session names already in the store), unsaved (session names which couldn't be saved into the store) and elapsed (seconds).
+        """
+        started_at = time.time()
+        results = {"sessions": {}, "failed": {}, "skipped": [], "unsaved": [], "elapsed": 0}
+        pending_accounts = []
+        for index, account in enumerate(accounts):
+            session_name = self.get_session_name(account)
+            if self.skip_saved and self.store is not None and session_name in self.store:
+                results["skipped"].append(session_name)
+                continue
+            pending_accounts.append((index, session_name, account))
+        unsaved_sessions = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="BulkLogin") as executor:
+            futures = {executor.submit(self.login_account, account, self._get_proxies(index, account)): session_name
+                       for index, session_name, account in pending_accounts}
+            for future in as_completed(futures):
+                session_name = futures[future]
+                try:
+                    session = future.result().session
+                except Exception as error:
+                    logger.warn(f"Couldn't log into {session_name}. {error}")
+                    results["failed"][session_name] = error
+                    continue
+                results["sessions"][session_name] = unsaved_sessions[session_name] = session
+                if len(unsaved_sessions) >= self.save_batch_size:
+                    self._save(unsaved_sessions, results)
+                    unsaved_sessions = {}
+        self._save(unsaved_sessions, results)
+        results["elapsed"] = round(time.time() - started_at, 3)
+        logger.info(f"{len(results['sessions'])} accounts logged in, {len(results['failed'])} failed, {len(results['skipped'])} skipped.")
+        return results
+
+
+if __name__ == "__main__":
+    pass
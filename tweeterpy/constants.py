@@ -12,6 +12,9 @@ API_TMP_FILE = "tweeterpy_api.json"
 # Directory path/name to save and load logged in sessions/cookies. Default path is current directory. i.e. current_path/Twitter Saved Sessions
 DEFAULT_SESSION_DIRECTORY = "Twitter Saved Sessions"
 
+# File name of the SessionStore database (inside DEFAULT_SESSION_DIRECTORY) holding the sessions of multiple accounts.
+DEFAULT_SESSION_STORE = "sessions.db"
+
 # File name to save logs.
 LOG_FILE_NAME = "tweeterpy.log"
 
@@ -45,7 +48,9 @@ LOGGING_CONFIG = {
             'formatter': 'standard',
             'class': 'logging.FileHandler',
             'filename': LOG_FILE_NAME,
-            "encoding": "utf-8"
+            "encoding": "utf-8",
+            # Log file is only created/opened on the first log record.
+            "delay": True
         }
     },
     'loggers': {
@@ -126,6 +131,14 @@ class Path:
     USER_HIGHLIGHTS_ENDPOINT = "w9-i9VNm_92GYFaiyGT1NA/UserHighlightsTweets"
 
 
+class PageSize:
+    # Used by the paginated methods when page_size is set to "auto".
+    # Largest page size (count) to try first. It is halved until the API accepts it.
+    AUTO_MAXIMUM = 1000
+    # Accepted page sizes learned from the responses. {operation_name: page_size}
+    learned = {}
+
+
 class FeatureSwitch:
     # Data will be added automatically upon API update (Manipulated by ApiUpdater in api_util.py).
     all_feature_switches = {}
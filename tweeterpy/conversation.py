@@ -0,0 +1,107 @@
+from functools import reduce
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from tweeterpy.timeline import TimelineParser
+from tweeterpy.utils.logging import get_logger
+from tweeterpy.constants import Path
+
+logger = get_logger(__name__)
+
+CONVERSATION_DATA_PATH = ('data', 'threaded_conversation_with_injections_v2', 'instructions')
+
+
+class ConversationCrawler:
+    """
+        Crawls a whole conversation (reply tree) of a tweet. Follows the bottom cursors as well as the nested "show more replies" cursors inside the conversation modules, expanding the branches concurrently within the rate limits.
+    """
+
+    def __init__(self, twitter, max_workers=4, max_requests=None, min_remaining_requests=1):
+        """
+        Args:
+            twitter (TweeterPy): Logged in TweeterPy object. (TweetDetail requires a logged in session.)
+            max_workers (int, optional): Number of branches expanded concurrently. Defaults to 4.
+            max_requests (int, optional): Max number of requests per crawl. If None, crawls the whole conversation. Defaults to None.
+            min_remaining_requests (int, optional): Stop scheduling new requests once the remaining API requests of the rate limit window reach this number. Defaults to 1.
+        """
+        self.twitter = twitter
+        self.max_workers = max_workers
+        self.max_requests = max_requests
+        self.min_remaining_requests = min_remaining_requests
+        self._parser = TimelineParser(include_cursors=True, record_types=["tweet", "cursor"])
+
+    def _fetch(self, tweet_id, cursor=None):
+        variables = {"focalTweetId": str(tweet_id), "referrer": "tweet", "with_rux_injections": False, "includePromotedContent": False,
+                     "withCommunity": True, "withQuickPromoteEligibilityTweetFields": True, "withArticleRichContent": False, "withBirdwatchNotes": False,
+                     "withVoice": True, "withV2Timeline": True}
+        if cursor:
+            variables["cursor"] = cursor
+        request_payload = self.twitter._generate_request_data(
+            Path.TWEET_DETAILS_ENDPOINT, variables, additional_features=True)
+        return self.twitter.request_client.request(**request_payload)
+
+    def _parse(self, response):
+        tweets, cursors = [], []
+        instructions = reduce(lambda data, key: data.get(key) or {}, CONVERSATION_DATA_PATH, response) or []
+        for record in self._parser.iter_parse(instructions):
+            if record.type == "tweet":
+                tweets.append(record.data)
+            elif record.cursor_type != "Top" and record.id:
+                cursors.append(record.id)
+        return tweets, cursors
+
+    def crawl(self, tweet_id):
+        """Crawls the conversation of a tweet.
+
+        Args:
+            tweet_id (int): Tweet ID.
+
+        Returns:
+            dict: Returns tweets {tweet_id: tweet}, children {parent_tweet_id: [reply_ids]}, root_id, requests_count, api_rate_limit and pending_cursors (cursors not followed due to the request/rate limits).
+        """
+        conversation = {"root_id": str(tweet_id), "tweets": {}, "children": {}, "requests_count": 1,
+                        "api_rate_limit": None, "pending_cursors": []}
+        seen_cursors = set()
+        remaining_requests = None
+
+        def add_tweet(tweet):
+            tweet_id = tweet["rest_id"]
+            if tweet_id in conversation["tweets"]:
+                return
+            conversation["tweets"][tweet_id] = tweet
+            parent_id = (tweet.get("legacy") or {}).get("in_reply_to_status_id_str")
+            if parent_id:
+                conversation["children"].setdefault(parent_id, []).append(tweet_id)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self._fetch, tweet_id)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        response = future.result()
+                    except Exception as error:
+                        logger.exception(error)
+                        continue
+                    api_rate_limit = response.get("api_rate_limit")
+                    if api_rate_limit:
+                        conversation["api_rate_limit"] = api_rate_limit
+                        remaining_requests = api_rate_limit.get("remaining_requests_count")
+                    tweets, cursors = self._parse(response)
+                    for tweet in tweets:
+                        add_tweet(tweet)
+                    for cursor in cursors:
+                        if cursor in seen_cursors:
+                            continue
+                        seen_cursors.add(cursor)
+                        requests_limit_reached = self.max_requests is not None and conversation["requests_count"] >= self.max_requests
+                        rate_limit_reached = remaining_requests is not None and remaining_requests - len(pending) <= self.min_remaining_requests
+                        if requests_limit_reached or rate_limit_reached:
+                            conversation["pending_cursors"].append(cursor)
+                            continue
+                        pending.add(executor.submit(self._fetch, tweet_id, cursor))
+                        conversation["requests_count"] += 1
+        logger.debug("Crawled %s tweets with %s requests.", len(conversation["tweets"]), conversation["requests_count"])
+        return conversation
+
+
+if __name__ == "__main__":
+    pass
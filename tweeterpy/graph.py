@@ -0,0 +1,211 @@
+import os
+import json
+import sqlite3
+from functools import reduce
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class IdIndex:
+    """
+        Set of (int64) user ids kept in a SQLite table (rowid, 8 bytes per id). Additions are persisted incrementally with the crawl checkpoints and the index doesn't need to fit in memory.
+    """
+
+    def __init__(self, connection, table="visited"):
+        self._connection = connection
+        self._table = table
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY)")
+
+    def __len__(self):
+        return self._connection.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def __contains__(self, user_id):
+        return self._connection.execute(f"SELECT 1 FROM {self._table} WHERE id = ?", (int(user_id),)).fetchone() is not None
+
+    def add(self, user_id):
+        """Adds an id to the index. Returns False if it was already there."""
+        cursor = self._connection.execute(f"INSERT OR IGNORE INTO {self._table} (id) VALUES (?)", (int(user_id),))
+        return cursor.rowcount == 1
+
+
+class Frontier:
+    """
+        Priority queue of the users to crawl, kept in a SQLite table ordered by (priority, depth, sequence).
+    """
+
+    def __init__(self, connection, table="frontier"):
+        self._connection = connection
+        self._table = table
+        # fmt: off
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (sequence INTEGER PRIMARY KEY, priority REAL NOT NULL, depth INTEGER NOT NULL, user_id TEXT NOT NULL)")
+        connection.execute(f"CREATE INDEX IF NOT EXISTS {table}_order ON {table} (priority, depth, sequence)")
+        # fmt: on
+
+    def __len__(self):
+        return self._connection.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def __bool__(self):
+        return self._connection.execute(f"SELECT 1 FROM {self._table} LIMIT 1").fetchone() is not None
+
+    def push(self, priority, depth, sequence, user_id):
+        self._connection.execute(f"INSERT INTO {self._table} (sequence, priority, depth, user_id) VALUES (?, ?, ?, ?)",
+                                 (sequence, priority, depth, str(user_id)))
+
+    def pop(self):
+        """Removes and returns the next node (priority, depth, sequence, user_id), None if the frontier is empty."""
+        node = self._connection.execute(
+            f"SELECT priority, depth, sequence, user_id FROM {self._table} ORDER BY priority, depth, sequence LIMIT 1").fetchone()
+        if node is not None:
+            self._connection.execute(f"DELETE FROM {self._table} WHERE sequence = ?", (node[2],))
+        return node
+
+
+class GraphCrawler:
+    """
+        Social graph crawler built on top of get_friends. Keeps a BFS (or custom priority) frontier with a depth limit and a visited index on disk (SQLite) and streams the edges to a CSV file, so large crawls run in bounded memory.
+        The crawl state is checkpointed incrementally (a single transaction per checkpoint) and can be resumed.
+    """
+
+    def __init__(self, twitter, edges_file, state_file=None, relation="follower", max_depth=1, priority=None, node_filter=None, checkpoint_every=10):
+        """
+        Args:
+            twitter (TweeterPy): Logged in TweeterPy object.
+            edges_file (str): CSV file the edges are appended to (source_id,target_id, source follows target).
+            state_file (str, optional): SQLite file to checkpoint the crawl state to (frontier, visited index, cursor and the edges file offset). If None, the state is kept in a temporary database and the crawl can't be resumed. Defaults to None.
+            relation (str, optional): Edges to crawl : "follower" or "following". Defaults to "follower".
+            max_depth (int, optional): Max distance from the seed users to expand. Defaults to 1.
+            priority (callable, optional): priority(user, depth) -> number, lower is crawled first. If None, crawls breadth first. Defaults to None.
+            node_filter (callable, optional): node_filter(user) -> bool, only the users it returns True for are expanded. Defaults to None.
+            checkpoint_every (int, optional): Save the state after every n pages. Defaults to 10.
+        """
+        if relation not in ("follower", "following"):
+            raise ValueError("relation must be either 'follower' or 'following'.")
+        self.twitter = twitter
+        self.edges_file = edges_file
+        self.state_file = state_file
+        self.relation = relation
+        self.max_depth = max_depth
+        self.priority = priority
+        self.node_filter = node_filter
+        self.checkpoint_every = checkpoint_every
+        # An empty filename is a temporary on-disk database (deleted on close) in SQLite.
+        self._connection = sqlite3.connect(state_file or "")
+        if state_file:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.visited = IdIndex(self._connection)
+        self.frontier = Frontier(self._connection)
+        # Node being crawled, resumed from the saved cursor. [priority, depth, sequence, user_id, cursor]
+        self.current = None
+        self._sequence = 0
+        # Size of the edges file at the last checkpoint. The edges written after it are written again on resume (their pages are fetched again).
+        self._edges_offset = None
+        self.stats = {"nodes": 0, "edges": 0, "pages": 0}
+        self._load_state()
+
+    def _load_state(self):
+        row = self._connection.execute("SELECT value FROM state WHERE key = 'crawl'").fetchone()
+        if row is None:
+            return
+        state = json.loads(row[0])
+        self.current = state["current"]
+        self._sequence = state["sequence"]
+        self._edges_offset = state["edges_offset"]
+        self.stats = state["stats"]
+        logger.info("Resuming the crawl, %s nodes in the frontier.", len(self.frontier))
+
+    def save_state(self):
+        """Commits the visited ids and the frontier changes since the last checkpoint together with the crawl state."""
+        state = {"current": self.current, "sequence": self._sequence, "edges_offset": self._edges_offset, "stats": self.stats}
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('crawl', ?)", (json.dumps(state),))
+
+    def close(self):
+        self._connection.close()
+
+    def _checkpoint(self, edges_file):
+        edges_file.flush()
+        self._edges_offset = edges_file.tell()
+        self.save_state()
+
+    def _push(self, user_id, depth, user=None):
+        priority = self.priority(user, depth) if self.priority else depth
+        self._sequence += 1
+        self.frontier.push(priority, depth, self._sequence, user_id)
+
+    def add_seeds(self, user_ids):
+        """Adds the users to start the crawl from (depth 0)."""
+        for user_id in user_ids:
+            user_id = self.twitter.get_user_id(user_id)
+            if self.visited.add(user_id):
+                self._push(user_id, 0)
+
+    @staticmethod
+    def _get_users(entries):
+        for entry in entries:
+            user = reduce(lambda data, key: data.get(key) or {}, ("content", "itemContent", "user_results", "result"), entry)
+            if user.get("rest_id"):
+                yield user
+
+    def crawl(self, seeds=None, max_nodes=None):
+        """Crawls the graph until the frontier is empty, max_nodes users are expanded or the rate limit is exhausted.
+
+        Args:
+            seeds (list, optional): User IDs/usernames to start from. Not needed when resuming. Defaults to None.
+            max_nodes (int, optional): Max number of users to expand in this run. Defaults to None.
+
+        Returns:
+            dict: Crawl stats. nodes, edges, pages, frontier (size), visited (size), completed (bool)
+        """
+        if seeds:
+            self.add_seeds(seeds)
+        nodes_count = 0
+        pages_count = 0
+        completed = False
+        with open(self.edges_file, "ab") as edges_file:
+            # Drop the edges written after the last checkpoint.
+            if self._edges_offset is not None and self._edges_offset < edges_file.seek(0, os.SEEK_END):
+                edges_file.truncate(self._edges_offset)
+                edges_file.seek(self._edges_offset)
+            while True:
+                if self.current is None:
+                    if not self.frontier or (max_nodes is not None and nodes_count >= max_nodes):
+                        completed = not self.frontier
+                        break
+                    self.current = list(self.frontier.pop()) + [None]
+                    nodes_count += 1
+                priority, depth, sequence, user_id, cursor = self.current
+                response = self.twitter.get_friends(user_id, follower=self.relation == "follower", following=self.relation == "following",
+                                                    end_cursor=cursor, pagination=False)
+                entries = response.get("data") or []
+                if not entries and response.get("has_next_page"):
+                    logger.warn("Couldn't get the %ss of %s, stopping the crawl.", self.relation, user_id)
+                    break
+                for user in self._get_users(entries):
+                    friend_id = user["rest_id"]
+                    edge = (friend_id, user_id) if self.relation == "follower" else (user_id, friend_id)
+                    edges_file.write(f"{edge[0]},{edge[1]}\n".encode())
+                    self.stats["edges"] += 1
+                    if depth + 1 <= self.max_depth and self.visited.add(friend_id):
+                        if self.node_filter is None or self.node_filter(user):
+                            self._push(friend_id, depth + 1, user)
+                self.stats["pages"] += 1
+                pages_count += 1
+                if response.get("has_next_page") and response.get("cursor_endpoint") and response.get("cursor_endpoint") != cursor:
+                    self.current[4] = response["cursor_endpoint"]
+                else:
+                    self.current = None
+                    self.stats["nodes"] += 1
+                if pages_count % self.checkpoint_every == 0:
+                    self._checkpoint(edges_file)
+                api_rate_limit = response.get("api_rate_limit") or {}
+                if api_rate_limit.get("rate_limit_exhausted"):
+                    logger.warn("Rate limit exhausted. Resets after %s", api_rate_limit.get("resets_after"))
+                    break
+            self._checkpoint(edges_file)
+        return dict(self.stats, frontier=len(self.frontier), visited=len(self.visited), completed=completed)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,221 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tweeterpy import util
+from tweeterpy.constants import Path
+from tweeterpy.utils.request import RequestClient
+from tweeterpy.utils.metrics import RequestHook
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Max-Age of the "gt" cookie set by x.com
+GUEST_TOKEN_TTL = 10800
+# Guest tokens are refreshed (or not reused) this many seconds before they expire.
+GUEST_TOKEN_REFRESH_MARGIN = 900
+
+
+def bootstrap_session(proxies=None, hooks=None, cache=None, recorder=None):
+    """Creates a guest session : new session with the default headers, x migration, client transaction (ondemand file) and an activated guest token.
+
+    Args:
+        proxies (dict, optional): Proxies to use. Format {"http":"proxy_here","https":"proxy_here"}. Defaults to None.
+        hooks (list, optional): Request hooks of the RequestClient. Defaults to None.
+        cache (ResponseCache, optional): Response cache of the RequestClient. Defaults to None.
+        recorder (RequestRecorder, optional): Request recorder of the RequestClient. Defaults to None.
+
+    Returns:
+        RequestClient: RequestClient of the guest session.
+    """
+    import curl_cffi
+    from x_client_transaction import ClientTransaction
+    request_client = RequestClient(session=curl_cffi.Session(impersonate="chrome"), hooks=hooks, cache=cache, recorder=recorder)
+    session = request_client.session
+    if proxies:
+        session.proxies = proxies
+        session.verify = False
+    session.headers.update(util.generate_headers())
+    home_page, home_page_data = util.handle_x_migration(session=session, return_page_data=True)
+    # Shared with ApiUpdater (see TweeterPy.update_api), the home page is downloaded only once.
+    request_client.home_page_data = home_page_data
+    ondemand_file_response = util.get_ondemand_file_response(
+        session=session, home_page=home_page, home_page_data=home_page_data)
+    request_client.client_transaction = ClientTransaction(
+        home_page_response=home_page, ondemand_file_response=ondemand_file_response)
+    try:
+        response = request_client.request(Path.GUEST_TOKEN_URL, method="POST")
+        if not response.get('guest_token'):
+            logger.debug(response)
+        guest_token = response.get('guest_token') or (
+            home_page_data or {}).get('guest_token') or util.find_guest_token(home_page)
+    except Exception as error:
+        logger.error(error)
+        raise
+    session.headers.update({'X-Guest-Token': guest_token})
+    session.cookies.update({'gt': guest_token})
+    request_client.bootstrapped_at = time.time()
+    return request_client
+
+
+class GuestToken(RequestHook):
+    """A warm guest session of the pool. Tracks its own rate limits (per operation) through the request hooks."""
+
+    def __init__(self, request_client):
+        self.request_client = request_client
+        self.guest_token = request_client.session.headers.get("X-Guest-Token")
+        self.created_at = time.time()
+        self.requests_count = 0
+        # {operation: rate limit reset timestamp}
+        self.rate_limited_until = {}
+        request_client.hooks.append(self)
+
+    def age(self):
+        return time.time() - self.created_at
+
+    def is_rate_limited(self, operation=None):
+        now = time.time()
+        if operation is not None:
+            return self.rate_limited_until.get(operation, 0) > now
+        return any(reset_at > now for reset_at in self.rate_limited_until.values())
+
+    def after_response(self, event):
+        self.requests_count += 1
+        rate_limit = event.rate_limit or {}
+        if event.status_code == 429 or rate_limit.get("rate_limit_exhausted"):
+            reset_after = rate_limit.get("reset_after_datetime_object")
+            self.rate_limited_until[event.operation] = time.time() + (reset_after.total_seconds() if reset_after else 900)
+
+
+class GuestTokenPool:
+    """
+        Keeps a pool of activated guest tokens warm (each one with its own session, cookie jar and client transaction) and round-robins the unauthenticated requests across them.
+        The tokens are refreshed in the background before they expire, the rate limited ones are skipped until their reset time.
+    """
+
+    def __init__(self, size=4, proxies=None, hooks=None, cache=None, recorder=None, ttl=GUEST_TOKEN_TTL, refresh_margin=GUEST_TOKEN_REFRESH_MARGIN, refresh_interval=60):
+        """
+        Args:
+            size (int, optional): Number of guest tokens to keep warm. Defaults to 4.
+            proxies (dict/list, optional): Proxies to use, a list of proxies is assigned to the tokens in turn. Format {"http":"proxy_here","https":"proxy_here"}. Defaults to None.
+            hooks (list, optional): Request hooks (i.e. tweeterpy.utils.metrics.MetricsAggregator) shared by the guest sessions. Defaults to None.
+            cache (ResponseCache, optional): Response cache shared by the guest sessions. Defaults to None.
+            recorder (RequestRecorder, optional): Request recorder shared by the guest sessions. Defaults to None.
+            ttl (int, optional): Lifetime of a guest token in seconds. Defaults to 10800.
+            refresh_margin (int, optional): Refresh a token this many seconds before it expires. Defaults to 900.
+            refresh_interval (int, optional): Seconds between the background checks. Defaults to 60.
+        """
+        self.size = size
+        self.proxies = proxies
+        self.hooks = list(hooks or [])
+        self.cache = cache
+        self.recorder = recorder
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self.refresh_interval = refresh_interval
+        self._tokens = [None] * size
+        self._index = 0
+        self._lock = threading.Lock()
+        # Held for the whole activation, so the concurrent get_client calls wait for the tokens.
+        self._start_lock = threading.Lock()
+        self._started = False
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def __len__(self):
+        return sum(1 for token in self._tokens if token is not None)
+
+    def _get_proxies(self, slot):
+        if isinstance(self.proxies, (list, tuple)):
+            proxies = self.proxies[slot % len(self.proxies)]
+        else:
+            proxies = self.proxies
+        if proxies and isinstance(proxies, str):
+            proxies = {'http': proxies, 'https': proxies}
+        return proxies
+
+    def _refresh_slot(self, slot):
+        try:
+            token = GuestToken(bootstrap_session(proxies=self._get_proxies(slot), hooks=list(self.hooks), cache=self.cache, recorder=self.recorder))
+        except Exception as error:
+            logger.warn(f"Couldn't activate a guest token. {error}")
+            return False
+        with self._lock:
+            self._tokens[slot] = token
+        logger.debug("Guest token %s activated (slot %s).", token.guest_token, slot)
+        return True
+
+    def start(self):
+        """Activates the guest tokens concurrently and starts the background refresh."""
+        with self._start_lock:
+            if self._started:
+                return self
+            self._stop_event.clear()
+            with ThreadPoolExecutor(max_workers=self.size) as executor:
+                activated = sum(executor.map(self._refresh_slot, range(self.size)))
+            if not activated:
+                raise Exception("Couldn't activate any guest token.")
+            logger.info(f"{activated}/{self.size} guest tokens activated.")
+            self._refresh_thread = threading.Thread(target=self._refresh_loop, name="GuestTokenPool", daemon=True)
+            self._refresh_thread.start()
+            self._started = True
+        return self
+
+    def stop(self):
+        """Stops the background refresh."""
+        with self._start_lock:
+            self._stop_event.set()
+            if self._refresh_thread is not None:
+                self._refresh_thread.join()
+                self._refresh_thread = None
+            self._started = False
+
+    def _refresh_loop(self):
+        while not self._stop_event.wait(self.refresh_interval):
+            for slot, token in enumerate(list(self._tokens)):
+                if self._stop_event.is_set():
+                    return
+                # Missing (failed activation) or about to expire.
+                if token is None or token.age() >= self.ttl - self.refresh_margin:
+                    self._refresh_slot(slot)
+
+    def get_client(self, operation=None):
+        """Returns the RequestClient of the next guest token (round-robin), skipping the expired ones and the ones rate limited for the operation.
+
+        Args:
+            operation (str, optional): GraphQL operation name (i.e. UserByScreenName). Defaults to None.
+
+        Returns:
+            RequestClient: RequestClient of a guest session.
+        """
+        if not self._started:
+            self.start()
+        with self._lock:
+            tokens = [token for token in self._tokens if token is not None and token.age() < self.ttl]
+            if not tokens:
+                raise Exception("No guest token available.")
+            for _ in range(len(tokens)):
+                token = tokens[self._index % len(tokens)]
+                self._index += 1
+                if not token.is_rate_limited(operation):
+                    return token.request_client
+        # Every token is rate limited, use the one which resets first.
+        logger.warn("All the guest tokens are rate limited.")
+        return min(tokens, key=lambda token: token.rate_limited_until.get(operation, 0)).request_client
+
+    def stats(self):
+        """Returns guest_token, age, requests_count and rate_limited_operations of every token."""
+        now = time.time()
+        with self._lock:
+            return [{"guest_token": token.guest_token, "age": round(token.age()), "requests_count": token.requests_count,
+                     "rate_limited_operations": [operation for operation, reset_at in token.rate_limited_until.items() if reset_at > now]}
+                    for token in self._tokens if token is not None]
+
+
+if __name__ == "__main__":
+    pass
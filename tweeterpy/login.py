@@ -1,15 +1,34 @@
 import random
 import datetime
-import pyotp
 from tweeterpy.constants import Path
 from tweeterpy.util import find_nested_key
 from tweeterpy.utils.request import RequestClient
-from tweeterpy.utils.logging import disable_logger
+from tweeterpy.utils.logging import disable_logger, get_logger
+
+logger = get_logger(__name__)
+
+# Verification codes tried per challenge when they come from a code_callback.
+MAX_VERIFICATION_ATTEMPTS = 3
 
 
 class TaskHandler:
-    def __init__(self, request_client: RequestClient = None):
+    def __init__(self, request_client: RequestClient = None, code_callback=None):
         self.request_client = request_client
+        # code_callback(username, task_id, message) returns the verification code (ACID, 2FA etc). If None, asks for it with input().
+        self.code_callback = code_callback
+        self.username = None
+
+    def _show(self, message):
+        # Non-interactive logins (code_callback) may run concurrently, they log instead of printing.
+        if self.code_callback is None:
+            print(message)
+        else:
+            logger.info("%s : %s", self.username, message.strip())
+
+    def _get_verification_code(self, task_id, message):
+        if self.code_callback is None:
+            return str(input(message))
+        return str(self.code_callback(self.username, task_id, message) or "").strip()
 
     def _create_task_mapper(self, username, password, verification_input_data):
         # fmt: off  - Turns off formatting for this block of code. Just for the readability purpose.
@@ -81,17 +100,25 @@ class TaskHandler:
         payload = {"flow_token": flow_token,
                    "subtask_inputs": [{"subtask_id": subtask_id, "enter_text": {"text": verification_input_data,"link":"next_link"}}]}
         handle_incorrect_input = True
+        attempts = 0
         while handle_incorrect_input:
             response = self.request_client.request(Path.TASK_URL, method="POST", json=payload, skip_error_checking=True)
+            attempts += 1
             if isinstance(response, dict) and "errors" in response.keys():
                 error_message = "\n".join([error['message'] for error in response['errors']])
-                payload['subtask_inputs'][0]['enter_text']['text'] = str(input(f"{error_message} - Type again ==> "))
+                # Non-interactive logins (code_callback) give up instead of retrying forever.
+                if self.code_callback is not None and attempts >= MAX_VERIFICATION_ATTEMPTS:
+                    raise Exception(error_message)
+                payload['subtask_inputs'][0]['enter_text']['text'] = self._get_verification_code(subtask_id, f"{error_message} - Type again ==> ")
             else:
                 handle_incorrect_input = False
         return response
 
     @disable_logger
-    def login(self, username, password, email=None, phone=None, mfa_secret=None, **kwargs):
+    def login(self, username, password, email=None, phone=None, mfa_secret=None, code_callback=None, **kwargs):
+        if code_callback is not None:
+            self.code_callback = code_callback
+        self.username = username or email
         response = None
         error_message = None
         tasks_pending = True
@@ -124,18 +151,19 @@ class TaskHandler:
                         identity_verification = True if hint_message == "phone or username" and input_type == "text" else False
                         two_fac_auth = True if task_id == "LoginTwoFactorAuthChallenge" and input_type == "number" and hint_message == "enter code" else False
                         if two_fac_auth and mfa_secret:
+                            import pyotp
                             totp = pyotp.TOTP(mfa_secret)
                             grace_time = datetime.timedelta(seconds=2)
                             otp_code = totp.at(datetime.datetime.now() + grace_time)
                         if input_type and hint_message and error_message:
-                            print(f"\n{error_message}\n")
-                            verification_input_data = phone if (phone_verification or identity_verification) and phone else email if (email_verification and email) else otp_code if (two_fac_auth and otp_code) else str(input(input_message)) if two_fac_auth or otp_required else None
+                            self._show(f"\n{error_message}\n")
+                            verification_input_data = phone if (phone_verification or identity_verification) and phone else email if (email_verification and email) else otp_code if (two_fac_auth and otp_code) else self._get_verification_code(task_id, input_message) if two_fac_auth or otp_required else None
                             if not verification_input_data:
                                 raise Exception(error_message)
                             task_flow_mapper[task_id].update({"task_parameter":verification_input_data})
                     if task_id == 'LoginSuccessSubtask':
                         tasks_pending = False
-                        print(task['task_output'])
+                        self._show(task['task_output'])
                         continue
                     if task['task_parameter'] is None:
                         response = task.get('task_executor')(flow_token,task_id)
@@ -143,7 +171,7 @@ class TaskHandler:
                         parameter = task.get('task_parameter')
                         response =  task.get('task_executor')(flow_token,task_id,parameter)
                 else:
-                    print(f"\n{response}")
+                    self._show(f"\n{response}")
                     tasks_pending = False
         except Exception as error:
             raise error
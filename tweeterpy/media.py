@@ -0,0 +1,146 @@
+import os
+from dataclasses import dataclass
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tweeterpy.timeline import TimelineParser
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MediaItem:
+    media_key: str
+    tweet_id: str
+    type: str
+    url: str
+
+    @property
+    def filename(self):
+        extension = os.path.splitext(urlparse(self.url).path)[1] or ".bin"
+        return f"{self.tweet_id}_{self.media_key}{extension}"
+
+
+def get_best_url(media, photo_size="orig"):
+    """Returns the best quality url of a media. Original size for photos, highest bitrate mp4 variant for videos/gifs.
+
+    Args:
+        media (dict): Media from the tweet's legacy.extended_entities.media.
+        photo_size (str, optional): Photo size : "orig", "4096x4096", "large" etc. Defaults to "orig".
+    """
+    variants = (media.get("video_info") or {}).get("variants") or []
+    mp4_variants = [variant for variant in variants if variant.get("content_type") == "video/mp4"]
+    if mp4_variants:
+        return max(mp4_variants, key=lambda variant: variant.get("bitrate", 0))["url"]
+    if media.get("media_url_https"):
+        return f"{media['media_url_https']}?name={photo_size}"
+    return None
+
+
+def extract_media(timeline, photo_size="orig"):
+    """Extracts the (de-duplicated by media key) media of the tweets.
+
+    Args:
+        timeline (dict/list): Result of get_user_media (or any other paginated method), its data or an API response.
+        photo_size (str, optional): Photo size : "orig", "4096x4096", "large" etc. Defaults to "orig".
+
+    Returns:
+        list: MediaItem objects.
+    """
+    if isinstance(timeline, dict) and "data" in timeline and isinstance(timeline["data"], list):
+        timeline = timeline["data"]
+    media_items = {}
+    for record in TimelineParser(record_types=["tweet"]).iter_parse(timeline):
+        legacy = record.data.get("legacy") or {}
+        medias = (legacy.get("extended_entities") or legacy.get("entities") or {}).get("media") or []
+        for media in medias:
+            media_key = media.get("media_key") or media.get("id_str")
+            url = get_best_url(media, photo_size=photo_size)
+            if not media_key or not url or media_key in media_items:
+                continue
+            media_items[media_key] = MediaItem(media_key=media_key, tweet_id=record.id, type=media.get("type"), url=url)
+    return list(media_items.values())
+
+
+class MediaDownloader:
+    """
+        Downloads the media of the tweets concurrently. Files are streamed to disk chunk by chunk, de-duplicated by media key, and interrupted downloads (.part files) are resumed with range requests.
+    """
+
+    def __init__(self, directory="media", max_workers=4, proxies=None, session=None, photo_size="orig", chunk_size=65536, overwrite=False):
+        """
+        Args:
+            directory (str, optional): Directory to save the media to. Defaults to "media".
+            max_workers (int, optional): Number of concurrent downloads. Defaults to 4.
+            proxies (dict, optional): Proxies to use. Format {"http":"proxy_here","https":"proxy_here"}. Defaults to None.
+            session (curl_cffi.Session, optional): Session to download with. Each worker thread gets its own connection (curl handle) of the session. If None, creates a new one. Defaults to None.
+            photo_size (str, optional): Photo size : "orig", "4096x4096", "large" etc. Defaults to "orig".
+            chunk_size (int, optional): Bytes written to the disk at a time. Defaults to 65536.
+            overwrite (bool, optional): Download the already downloaded files again. Defaults to False.
+        """
+        self.directory = directory
+        self.max_workers = max_workers
+        self.photo_size = photo_size
+        self.chunk_size = chunk_size
+        self.overwrite = overwrite
+        if session is None:
+            import curl_cffi
+            session = curl_cffi.Session(impersonate="chrome")
+            if proxies:
+                session.proxies = proxies
+        self.session = session
+
+    def _download(self, media_item):
+        filename = os.path.join(self.directory, media_item.filename)
+        if os.path.exists(filename) and not self.overwrite:
+            return filename, False
+        temp_file = f"{filename}.part"
+        downloaded_bytes = os.path.getsize(temp_file) if os.path.exists(temp_file) else 0
+        headers = {"Range": f"bytes={downloaded_bytes}-"} if downloaded_bytes else {}
+        response = self.session.get(media_item.url, headers=headers, stream=True)
+        try:
+            if response.status_code == 416:
+                # Range not satisfiable, the part file is already complete.
+                os.replace(temp_file, filename)
+                return filename, True
+            response.raise_for_status()
+            # 206 - Resumed. 200 - Server ignored the range, start over.
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(temp_file, mode) as file:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    file.write(chunk)
+        finally:
+            response.close()
+        os.replace(temp_file, filename)
+        return filename, True
+
+    def download(self, timeline):
+        """Downloads the media of the tweets.
+
+        Args:
+            timeline (dict/list): Result of get_user_media (or any other paginated method), its data, an API response or a list of MediaItem objects.
+
+        Returns:
+            dict: files {media_key: filename}, downloaded (count), skipped (already downloaded count), failed {media_key: error}
+        """
+        media_items = timeline if timeline and isinstance(timeline, list) and isinstance(timeline[0], MediaItem) else extract_media(timeline, photo_size=self.photo_size)
+        os.makedirs(self.directory, exist_ok=True)
+        result = {"files": {}, "downloaded": 0, "skipped": 0, "failed": {}}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._download, media_item): media_item for media_item in {item.media_key: item for item in media_items}.values()}
+            for future in as_completed(futures):
+                media_key = futures[future].media_key
+                try:
+                    filename, downloaded = future.result()
+                except Exception as error:
+                    logger.warn("Couldn't download %s. %s", futures[future].url, error)
+                    result["failed"][media_key] = error
+                    continue
+                result["files"][media_key] = filename
+                result["downloaded" if downloaded else "skipped"] += 1
+        logger.debug("%s media downloaded, %s skipped, %s failed.", result["downloaded"], result["skipped"], len(result["failed"]))
+        return result
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,144 @@
+import time
+import threading
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from tweeterpy import util
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ShardedSearch:
+    """
+        Splits a search into since_time/until_time windows (shards) and runs them concurrently, across multiple sessions if given.
+        The window size adapts to the result density (i.e. small windows for the busy hours), the results are merged newest first without duplicates.
+    """
+
+    def __init__(self, twitter, max_workers=4, window=3600, min_window=60, max_window=2592000, results_per_shard=200, page_size=None):
+        """
+        Args:
+            twitter (TweeterPy/list): Logged in TweeterPy object, or a list of them to spread the shards across the sessions (round-robin).
+            max_workers (int, optional): Number of shards fetched concurrently. Defaults to 4.
+            window (int, optional): Initial window size in seconds. Defaults to 3600.
+            min_window (int, optional): Min window size in seconds. Defaults to 60.
+            max_window (int, optional): Max window size in seconds. Defaults to 2592000 (30 days).
+            results_per_shard (int, optional): Target number of results per shard, the next windows are sized for it from the density of the finished shards. Defaults to 200.
+            page_size (int/str, optional): Page size of the shard requests (see TweeterPy.search). Defaults to None.
+        """
+        self.twitters = list(twitter) if isinstance(twitter, (list, tuple)) else [twitter]
+        self.max_workers = max_workers
+        self.window = window
+        self.min_window = min_window
+        self.max_window = max_window
+        self.results_per_shard = results_per_shard
+        self.page_size = page_size
+
+    def _fetch(self, shard_index, search_query, since_time, until_time, search_filter, total, cancelled):
+        twitter = self.twitters[shard_index % len(self.twitters)]
+        query = f"{search_query} since_time:{since_time} until_time:{until_time}"
+        # The cancellation is checked with the entries of every page, a cancelled shard stops after its current page.
+        return twitter.search(query, total=total, search_filter=search_filter, page_size=self.page_size, stop_condition=lambda entry: cancelled.is_set())
+
+    def _next_window(self, window, results_count, duration):
+        if not results_count:
+            # Empty shard, try a much larger window.
+            return min(self.max_window, window * 4)
+        density = results_count / max(duration, 1)
+        return int(min(self.max_window, max(self.min_window, self.results_per_shard / density)))
+
+    def iter_shards(self, search_query, since, until=None, search_filter="Latest", total=None):
+        """Yields (shard, entries) in order (newest window first). shard is a dict with since_time, until_time and error (if the shard failed).
+        Closing the generator cancels the shards in flight.
+
+        Args:
+            search_query (str): Search term. Don't include since/until operators, the windows are added to it.
+            since (datetime/str/int): Oldest date (inclusive). datetime object, ISO 8601 date string i.e. "2026-01-01" or unix timestamp.
+            until (datetime/str/int, optional): Newest date (exclusive). Defaults to None (now).
+            search_filter (str, optional): Latest, Photos or Videos (the time ordered filters). Defaults to "Latest".
+            total (int, optional): Max number of results fetched per shard. Defaults to None.
+        """
+        since_time = int(util.get_timestamp(since))
+        until_time = int(util.get_timestamp(until)) if until is not None else int(time.time())
+        window = self.window
+        shard_count, next_index = 0, 0
+        completed = {}
+        cancelled = threading.Event()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            try:
+                while pending or until_time > since_time:
+                    # Keep max_workers shards in flight, walking the windows backwards from until.
+                    while len(pending) < self.max_workers and until_time > since_time:
+                        shard = {"index": shard_count, "since_time": max(since_time, until_time - window), "until_time": until_time, "error": None}
+                        future = executor.submit(self._fetch, shard_count, search_query, shard["since_time"], shard["until_time"], search_filter, total, cancelled)
+                        pending[future] = shard
+                        until_time = shard["since_time"]
+                        shard_count += 1
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        shard = pending.pop(future)
+                        entries = []
+                        try:
+                            response = future.result()
+                            entries = response.get("data") or []
+                            # The pagination doesn't raise, it stops and returns the entries fetched before the error (i.e. a rate limit).
+                            shard["error"] = response.get("error")
+                        except Exception as error:
+                            logger.exception(error)
+                            shard["error"] = error
+                        # A failed shard says nothing about the density.
+                        if shard["error"] is None:
+                            window = self._next_window(window, len(entries), shard["until_time"] - shard["since_time"])
+                        completed[shard["index"]] = (shard, entries)
+                    # Ordered merge : the shards finish in any order, yield the contiguous newest ones.
+                    while next_index in completed:
+                        yield completed.pop(next_index)
+                        next_index += 1
+            finally:
+                cancelled.set()
+                for future in pending:
+                    future.cancel()
+        logger.debug("Searched %s shards.", shard_count)
+
+    def iter_search(self, search_query, since, until=None, total=None, search_filter="Latest", shards=None):
+        """Yields the search entries newest first, without duplicates. Same arguments as search.
+
+        Args:
+            shards (list, optional): The finished shards (see iter_shards) are appended to it, i.e. to check the failed ones. Defaults to None.
+        """
+        seen_keys = set()
+        results_count = 0
+        with closing(self.iter_shards(search_query, since, until=until, search_filter=search_filter, total=total)) as shards_iterator:
+            for shard, entries in shards_iterator:
+                if shards is not None:
+                    shards.append(shard)
+                for entry in entries:
+                    entry_key = util.get_entry_key(entry)
+                    if entry_key in seen_keys:
+                        continue
+                    seen_keys.add(entry_key)
+                    yield entry
+                    results_count += 1
+                    if total is not None and results_count >= total:
+                        return
+
+    def search(self, search_query, since, until=None, total=None, search_filter="Latest"):
+        """Get search results of a time range, with the shards fetched concurrently.
+
+        Args:
+            search_query (str): Search term. Don't include since/until operators, the windows are added to it.
+            since (datetime/str/int): Oldest date (inclusive). datetime object, ISO 8601 date string i.e. "2026-01-01" or unix timestamp.
+            until (datetime/str/int, optional): Newest date (exclusive). Defaults to None (now).
+            total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
+            search_filter (str, optional): Latest, Photos or Videos (the time ordered filters). Defaults to "Latest".
+
+        Returns:
+            dict: Returns data, shards_count and failed_shards ([(since_time, until_time)] windows which couldn't be fetched, i.e. to retry them later).
+        """
+        shards = []
+        data = list(self.iter_search(search_query, since, until=until, total=total, search_filter=search_filter, shards=shards))
+        return {"data": data, "shards_count": len(shards),
+                "failed_shards": [(shard["since_time"], shard["until_time"]) for shard in shards if shard["error"] is not None]}
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,103 @@
+import os
+import json
+import time
+from tweeterpy import util
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TimelineSync:
+    """
+        Incremental sync of timelines and searches. Stores the newest seen tweet id and the top cursor per target, so the next run only fetches the tweets newer than the previous one instead of re-downloading the whole history.
+    """
+
+    def __init__(self, twitter, state_file=None, use_top_cursor=False):
+        """
+        Args:
+            twitter (TweeterPy): TweeterPy object used to fetch the data.
+            state_file (str, optional): JSON file to persist the sync state. If None, the state is kept in memory only. Defaults to None.
+            use_top_cursor (bool, optional): Page forward from the stored top cursor instead of starting from the newest page. Stopping at the first known tweet id still applies. Defaults to False.
+        """
+        self.twitter = twitter
+        self.state_file = state_file
+        self.use_top_cursor = use_top_cursor
+        self.state = self._load_state()
+
+    def _load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, "r") as file:
+                return json.load(file)
+        except Exception as error:
+            logger.warn("Couldn't load the sync state. %s", error)
+            return {}
+
+    def save(self):
+        """Writes the sync state to the state file."""
+        if not self.state_file:
+            return
+        temp_file = f"{self.state_file}.tmp"
+        with open(temp_file, "w") as file:
+            json.dump(self.state, file)
+        os.replace(temp_file, self.state_file)
+
+    def reset(self, key=None):
+        """Forgets the sync state of a target (or of all the targets if key is None)."""
+        if key is None:
+            self.state.clear()
+        else:
+            self.state.pop(key, None)
+        self.save()
+
+    def _sync(self, key, fetch, total=None):
+        target_state = self.state.get(key, {})
+        since_id = target_state.get("newest_id")
+        end_cursor = target_state.get("top_cursor") if self.use_top_cursor and since_id else None
+        result = fetch(end_cursor=end_cursor, total=total, since_id=since_id)
+        tweet_ids = [tweet_id for tweet_id in map(util.get_tweet_id, result.get("data", [])) if tweet_id]
+        newest_id = max(tweet_ids + [int(since_id or 0)]) or None
+        target_state.update({"newest_id": str(newest_id) if newest_id else None,
+                             "top_cursor": result.get("cursor_top") or target_state.get("top_cursor"),
+                             "synced_at": time.time()})
+        self.state[key] = target_state
+        self.save()
+        result["newest_id"] = target_state["newest_id"]
+        logger.debug("%s synced, %s new entries.", key, len(result.get("data", [])))
+        return result
+
+    def user_tweets(self, user_id, with_replies=False, total=None):
+        """Fetches the tweets posted since the last sync of this user.
+
+        Args:
+            user_id (int): User ID.
+            with_replies (bool, optional): Sync the tweets and replies timeline. Defaults to False.
+            total (int, optional): Total(Max) number of new results you want to get. If None, extracts all new results. Defaults to None.
+
+        Returns:
+            dict: Returns data, cursor_endpoint, cursor_top, has_next_page, newest_id
+        """
+        user_id = self.twitter.get_user_id(user_id)
+        return self._sync(f"user_tweets:{user_id}:{int(with_replies)}",
+                          lambda **kwargs: self.twitter.get_user_tweets(user_id, with_replies=with_replies, **kwargs), total=total)
+
+    def user_media(self, user_id, total=None):
+        """Fetches the media posted since the last sync of this user."""
+        user_id = self.twitter.get_user_id(user_id)
+        return self._sync(f"user_media:{user_id}",
+                          lambda **kwargs: self.twitter.get_user_media(user_id, **kwargs), total=total)
+
+    def list_tweets(self, list_id, total=None):
+        """Fetches the tweets posted in a list since the last sync."""
+        return self._sync(f"list_tweets:{list_id}",
+                          lambda **kwargs: self.twitter.get_list_tweets(list_id, **kwargs), total=total)
+
+    def search(self, search_query, total=None):
+        """Fetches the (Latest) search results posted since the last sync of this query."""
+        return self._sync(f"search:{search_query}",
+                          lambda **kwargs: self.twitter.search(search_query, search_filter="Latest", **kwargs), total=total)
+
+
+if __name__ == "__main__":
+    pass
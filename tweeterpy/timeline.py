@@ -0,0 +1,154 @@
+from typing import List
+from dataclasses import dataclass, field
+from tweeterpy.util import find_nested_key
+
+
+@dataclass
+class TimelineRecord:
+    """Flat record of a single timeline item. type is "tweet", "user" or "cursor". id is the rest_id (cursor value for cursors)."""
+    type: str
+    id: str
+    entry_id: str
+    data: dict = field(default=None, repr=False)
+    cursor_type: str = None
+    module_id: str = None
+    promoted: bool = False
+    pinned: bool = False
+
+
+class TimelineParser:
+    """
+        Parses timeline instructions (TimelineAddEntries, TimelinePinEntry, TimelineReplaceEntry, TimelineAddToModule etc.) in a single pass. Unwraps items, modules (profile conversations, who-to-follow etc.), cursors and promoted entries into flat TimelineRecord objects.
+    """
+
+    def __init__(self, drop_promoted=False, include_cursors=False, record_types=None):
+        """
+        Args:
+            drop_promoted (bool, optional): Skip the promoted tweets/users. Defaults to False.
+            include_cursors (bool, optional): Emit the cursors as records as well. Defaults to False.
+            record_types (list, optional): Only emit these record types, i.e. ["tweet"]. Defaults to None (all types).
+        """
+        self.drop_promoted = drop_promoted
+        self.include_cursors = include_cursors
+        self.record_types = set(record_types) if record_types else None
+        # Instructions without any entries (TimelineClearCache, TimelineTerminateTimeline, TimelineShowAlert etc.) are skipped.
+        self._instruction_handlers = {"TimelineAddEntries": lambda instruction: ((entry, False) for entry in instruction.get("entries") or []),
+                                      "TimelinePinEntry": lambda instruction: [(instruction.get("entry") or {}, True)],
+                                      "TimelineReplaceEntry": lambda instruction: [(instruction.get("entry") or {}, False)],
+                                      "TimelineAddToModule": self._get_module_items}
+        self._item_handlers = {"tweet_results": self._parse_tweet,
+                               "user_results": self._parse_user,
+                               "cursorType": self._parse_cursor}
+
+    @staticmethod
+    def _get_module_items(instruction):
+        module_id = instruction.get("moduleEntryId")
+        return ((dict(item, moduleEntryId=module_id), False) for item in instruction.get("moduleItems") or [])
+
+    @staticmethod
+    def _get_instructions(timeline):
+        if isinstance(timeline, dict):
+            if "instructions" in timeline:
+                return timeline["instructions"]
+            if "entryId" in timeline:
+                return [{"type": "TimelineAddEntries", "entries": [timeline]}]
+            instructions = find_nested_key(timeline, "instructions")
+            return instructions if instructions and isinstance(instructions[0], dict) else []
+        if timeline and isinstance(timeline[0], dict) and "entryId" in timeline[0]:
+            # Entries returned by the paginated methods. (data)
+            return [{"type": "TimelineAddEntries", "entries": timeline}]
+        return timeline or []
+
+    def _parse_tweet(self, item_content):
+        result = (item_content.get("tweet_results") or {}).get("result") or {}
+        # {"__typename": "TweetWithVisibilityResults", "tweet": {...}}
+        result = result.get("tweet") or result
+        return ("tweet", result.get("rest_id"), result, None) if result.get("rest_id") else None
+
+    def _parse_user(self, item_content):
+        result = (item_content.get("user_results") or {}).get("result") or {}
+        return ("user", result.get("rest_id"), result, None) if result.get("rest_id") else None
+
+    def _parse_cursor(self, item_content):
+        if not self.include_cursors:
+            return None
+        return ("cursor", item_content.get("value"), None, item_content.get("cursorType"))
+
+    def _parse_item(self, entry_id, item_content, module_id, pinned):
+        for key, handler in self._item_handlers.items():
+            if key in item_content:
+                parsed_item = handler(item_content)
+                break
+        else:
+            return None
+        if parsed_item is None:
+            return None
+        record_type, record_id, data, cursor_type = parsed_item
+        if self.record_types is not None and record_type not in self.record_types:
+            return None
+        promoted = entry_id.startswith("promoted-") or "promotedMetadata" in item_content
+        if promoted and self.drop_promoted:
+            return None
+        return TimelineRecord(type=record_type, id=record_id, entry_id=entry_id, data=data, cursor_type=cursor_type,
+                              module_id=module_id, promoted=promoted, pinned=pinned)
+
+    def iter_parse(self, timeline):
+        """Yields TimelineRecord objects. timeline can be an API response, a list of instructions or the data (entries) returned by the paginated methods."""
+        # fmt: off
+        for instruction in self._get_instructions(timeline):
+            handler = self._instruction_handlers.get(instruction.get("type"))
+            if handler is None:
+                continue
+            for entry, pinned in handler(instruction):
+                entry_id = entry.get("entryId", "")
+                content = entry.get("content") or entry.get("item") or {}
+                module_id = entry.get("moduleEntryId")
+                if "items" in content:
+                    # TimelineTimelineModule
+                    items = [(item.get("entryId", ""), (item.get("item") or {}).get("itemContent") or {}) for item in content["items"]]
+                    module_id = entry_id
+                else:
+                    items = [(entry_id, content.get("itemContent") or content)]
+                for item_entry_id, item_content in items:
+                    record = self._parse_item(item_entry_id, item_content, module_id, pinned)
+                    if record is not None:
+                        yield record
+        # fmt: on
+
+    def parse(self, timeline) -> List[TimelineRecord]:
+        return list(self.iter_parse(timeline))
+
+
+def get_timeline_entries(instructions):
+    """Returns the raw entries of all the instructions. (TimelineAddEntries entries, TimelineReplaceEntry entry, TimelineAddToModule module items)
+
+    The TimelinePinEntry entry is left out on purpose, like before : a pinned (old) tweet on the first page would trip since_id and the stop conditions of the pagination. Use TimelineParser on the raw response to get it (pinned=True).
+    """
+    entries = []
+    for instruction in instructions:
+        if "entries" in instruction:
+            entries.extend(instruction["entries"])
+        elif "moduleItems" in instruction:
+            entries.extend(instruction["moduleItems"])
+        elif instruction.get("type") == "TimelineReplaceEntry" and instruction.get("entry"):
+            entries.append(instruction["entry"])
+    return entries
+
+
+def parse_timeline(timeline, drop_promoted=False, include_cursors=False, record_types=None):
+    """Parses a timeline into flat TimelineRecord objects. See TimelineParser.
+
+    Args:
+        timeline (dict/list): API response, list of instructions or the data (entries) returned by the paginated methods.
+        drop_promoted (bool, optional): Skip the promoted tweets/users. Defaults to False.
+        include_cursors (bool, optional): Emit the cursors as records as well. Defaults to False.
+        record_types (list, optional): Only emit these record types, i.e. ["tweet"]. Defaults to None (all types).
+
+    Returns:
+        list: TimelineRecord objects.
+    """
+    return TimelineParser(drop_promoted=drop_promoted, include_cursors=include_cursors, record_types=record_types).parse(timeline)
+
+
+if __name__ == "__main__":
+    pass
@@ -1,43 +1,60 @@
 import json
+import time
 import random
 import getpass
-import logging.config
-import curl_cffi
 from functools import reduce
-from typing import Union, Dict
-from x_client_transaction import ClientTransaction
+from typing import Union, Dict, List
 
 from tweeterpy import util
 from tweeterpy.login import TaskHandler
 from tweeterpy.updater import ApiUpdater
+from tweeterpy.guest import GUEST_TOKEN_TTL, GUEST_TOKEN_REFRESH_MARGIN, GuestTokenPool, bootstrap_session
+from tweeterpy.timeline import get_timeline_entries
 from tweeterpy.utils.request import RequestClient
-from tweeterpy.utils.logging import set_log_level
+from tweeterpy.utils.metrics import RequestHook, get_operation_name
+from tweeterpy.utils.cache import ResponseCache
+from tweeterpy.utils.recorder import RequestRecorder
+from tweeterpy.utils.hedge import RequestHedger
+from tweeterpy.utils.logging import configure_logging, set_log_level, get_logger
 from tweeterpy.utils.session import load_session, save_session
-from tweeterpy.constants import Path, FeatureSwitch, LOGGING_CONFIG
+from tweeterpy.constants import Path, FeatureSwitch, PageSize
 
-logging.config.dictConfig(LOGGING_CONFIG)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 class TweeterPy:
 
-    def __init__(self, proxies: Dict[str, str] = None, log_level: Union[str, int] = None):
+    def __init__(self, proxies: Dict[str, str] = None, log_level: Union[str, int] = None, hooks: List[RequestHook] = None, cache: ResponseCache = None, recorder: RequestRecorder = None, guest_pool: GuestTokenPool = None, hedger: RequestHedger = None, setup_logging: bool = True):
         """TweeterPy constructor
 
         Args:
             proxies (dict, optional): Proxies to use. Format {"http":"proxy_here","https":"proxy_here"}. Defaults to None.
-            log_level (str, optional): Logging level : "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL". Defaults to None.
+            log_level (str, optional): Logging level : "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL". Defaults to None ("INFO", or left unchanged if setup_logging is False).
+            hooks (list, optional): Request hooks (i.e. tweeterpy.utils.metrics.MetricsAggregator) to collect metrics or traces of every request. Defaults to None.
+            cache (ResponseCache, optional): Response cache (tweeterpy.utils.cache.MemoryCache or DiskCache) for the repeated GET requests. Cached responses don't cost any API quota. Defaults to None.
+            recorder (RequestRecorder, optional): Records every response (tweeterpy.utils.recorder.RequestRecorder) as fixtures, i.e. for the offline benchmarks. Defaults to None.
+            guest_pool (GuestTokenPool, optional): Pool of warm guest tokens (tweeterpy.guest.GuestTokenPool). The unauthenticated reads (get_user_data, get_tweet, get_user_tweets) are spread across its tokens while not logged in. Defaults to None.
+            hedger (RequestHedger, optional): Hedges the slow single item lookups (get_user_data, get_tweet, get_user_info) on a second session (tweeterpy.utils.hedge.RequestHedger), the next guest token of guest_pool if any. Defaults to None.
+            setup_logging (bool, optional): Apply the tweeterpy logging configuration (console + tweeterpy.log handlers). Set to False when embedding TweeterPy in an application which configures the logging itself. Defaults to True.
         """
-        if log_level is None:
+        if log_level is None and setup_logging:
             log_level = "INFO"
 
         if proxies and isinstance(proxies, str):
             proxies = {'http': proxies, 'https': proxies}
 
         self.proxies = proxies
+        self.hooks = list(hooks or [])
+        self.cache = cache
+        self.recorder = recorder
+        self.guest_pool = guest_pool
+        self.hedger = hedger
         self.request_client: RequestClient = None
 
-        set_log_level(log_level, external_only=False)
+        if setup_logging:
+            configure_logging()
+        if log_level is not None:
+            set_log_level(log_level, external_only=False)
         self.generate_session()
 
         # update api endpoints
@@ -54,9 +71,11 @@ class TweeterPy:
         if self.request_client is None:
             self.generate_session()
         token = self.request_client.session.headers.pop("Authorization")
+        # Reuse the home page of the session bootstrap instead of downloading it again.
+        home_page_data, self.request_client.home_page_data = self.request_client.home_page_data, None
         try:
             ApiUpdater(request_client=self.request_client,
-                       restore_cache=restore_cache)
+                       restore_cache=restore_cache, home_page_data=home_page_data)
         except Exception as error:
             logger.warn(error)
         self.request_client.session.headers.update({"Authorization": token})
@@ -72,16 +91,39 @@ class TweeterPy:
             query_params["features"] = json.dumps(features)
         # fmt: on   
         request_payload = {"url": url, "params": query_params}
-        logger.debug(f"Request Payload => {request_payload}")
+        logger.debug("Request Payload => %s", request_payload)
         return request_payload
 
-    def _handle_pagination(self, url, params, end_cursor=None, data_path=None, total=None, pagination=True, **kwargs):
+    def _get_read_client(self, url=None):
+        # Unauthenticated reads are spread across the guest token pool, if any.
+        if self.guest_pool is None or self.logged_in():
+            return self.request_client
+        return self.guest_pool.get_client(get_operation_name(url) if url else None)
+
+    def _lookup(self, request_payload):
+        # Single item lookups, hedged if a hedger is set.
+        request_client = self._get_read_client(request_payload['url'])
+        if self.hedger is None:
+            return request_client.request(**request_payload)
+        return self.hedger.request(request_client, lambda: self._get_read_client(request_payload['url']), **request_payload)
+
+    def _handle_pagination(self, url, params, end_cursor=None, data_path=None, total=None, pagination=True, page_size=None, since_id=None, stop_condition=None, deduplicate=True, **kwargs):
         # fmt: off  - Turns off formatting for this block of code. Just for the readability purpose.
         def filter_data(response):
             filtered_data = []
             for each_entry in response:
                 if each_entry['entryId'].startswith('cursor-top') or each_entry['entryId'].startswith('cursor-bottom'):
                     continue
+                if stop_conditions and any(condition(each_entry) for condition in stop_conditions):
+                    # i.e. Reached an already known or too old tweet, everything after it is older.
+                    data_container["has_next_page"] = False
+                    return filtered_data
+                if seen_keys is not None:
+                    # Same tweets/users are often returned again on the next pages.
+                    entry_key = util.get_entry_key(each_entry)
+                    if entry_key in seen_keys:
+                        continue
+                    seen_keys.add(entry_key)
                 filtered_data.append(each_entry)
                 if total is not None and (len(data_container['data']) + len(filtered_data)) >= total:
                     return filtered_data
@@ -90,23 +132,60 @@ class TweeterPy:
         if not pagination and total:
             logger.warn("Either enable the pagination or disable total number of results.")
             raise Exception("pagination cannot be disabled while the total number of results are specified.")
-        data_container = {"data": [],"cursor_endpoint": None, "has_next_page": True, "api_rate_limit": None}
+
+        def set_page_size(count):
+            variables = json.loads(params['variables'])
+            variables['count'] = count
+            params['variables'] = json.dumps(variables)
+
+        operation, default_page_size = None, None
+        if page_size == "auto":
+            operation = get_operation_name(url)
+            default_page_size = json.loads(params['variables']).get('count', 20)
+            page_size = PageSize.learned.get(operation, max(PageSize.AUTO_MAXIMUM, default_page_size))
+        if page_size:
+            set_page_size(int(page_size))
+
+        stop_conditions = [stop_condition] if stop_condition else []
+        if since_id is not None:
+            stop_conditions.append(util.id_below(since_id, inclusive=True))
+
+        # set by default, or a user provided set-like object (i.e. util.BloomFilter for huge crawls, or shared between calls)
+        seen_keys = set() if deduplicate is True else None
+        if hasattr(deduplicate, 'add') and hasattr(deduplicate, '__contains__'):
+            seen_keys = deduplicate
+
+        # error : the exception which stopped the pagination early (the data fetched before it is kept), None otherwise.
+        data_container = {"data": [],"cursor_endpoint": None, "cursor_top": None, "has_next_page": True, "api_rate_limit": None, "error": None}
         while data_container["has_next_page"]:
             try:
                 if end_cursor:
                     variables = json.loads(params['variables'])
                     variables['cursor'] = end_cursor
                     params['variables'] = json.dumps(variables)
-                response = self.request_client.request(url, params=params)
+                # Adaptive page size - Halve the page size (down to the default one) while the API rejects the count. Any other error is raised as usual.
+                response = self._get_read_client(url).request(url, params=params, skip_error_checking=operation is not None)
+                if operation is not None:
+                    if util.is_page_size_rejected(response) and page_size > default_page_size:
+                        page_size = max(default_page_size, page_size // 2)
+                        logger.debug("Retrying %s with page size %s.", operation, page_size)
+                        set_page_size(page_size)
+                        continue
+                    response = util.check_for_errors(response)
+                    if PageSize.learned.get(operation) != page_size:
+                        PageSize.learned[operation] = page_size
                 data_container['api_rate_limit'] = response.get("api_rate_limit")
                 entries = reduce(lambda entry, key: entry.get(key, {}), data_path, response)
                 if not entries:
                     return data_container
-                data = [item for item in entries if item['type'] == 'TimelineAddEntries'][0]['entries']
+                # Entries, module items (i.e. media grid pages) and the replaced cursors (i.e. search pages).
+                data = get_timeline_entries(entries)
                 top_cursor = [
                     entry for entry in data if entry['entryId'].startswith('cursor-top')]
                 if top_cursor:
-                    top_cursor = reduce(dict.get, ('content','value'),top_cursor[0]) or reduce(dict.get, ('content','itemContent','value'),end_cursor[0])
+                    top_cursor = reduce(dict.get, ('content','value'),top_cursor[0]) or reduce(dict.get, ('content','itemContent','value'),top_cursor[0])
+                    # Top cursor of the first page points to the newest entries (Used for incremental syncs).
+                    data_container['cursor_top'] = data_container['cursor_top'] or top_cursor
                 end_cursor = [
                     entry for entry in data if entry['entryId'].startswith('cursor-bottom')]
                 if end_cursor:
@@ -130,6 +209,7 @@ class TweeterPy:
 
             except Exception as error:
                 logger.exception(error)
+                data_container["error"] = error
                 return data_container
 
     @property
@@ -139,17 +219,23 @@ class TweeterPy:
 
     @session.setter
     def session(self, session):
-        if not isinstance(session, curl_cffi.requests.session.Session):
+        from curl_cffi.requests.session import Session
+        if not isinstance(session, Session):
             raise Exception("invalid session")
-        self.request_client = RequestClient(session=session)
+        self.request_client = RequestClient(session=session, hooks=self.hooks, cache=self.cache, recorder=self.recorder)
 
     @property
     def me(self):
-        """Returns logged in user information.
+        """Returns logged in user information. Cached per session, fetched again only after the auth state changed (login, new/loaded session, auth_token cookie update).
 
         Returns:
             dict: Currently logged in user's data.
         """
+        if not self.logged_in():
+            logger.info("Guest Session")
+            return
+        if self.request_client.viewer is not None:
+            return self.request_client.viewer
         variables = {"withCommunitiesMemberships": True,
                      "withSubscribedTab": True, "withCommunitiesCreation": True}
         request_payload = self._generate_request_data(
@@ -158,6 +244,7 @@ class TweeterPy:
             response = self.request_client.request(**request_payload)
             if not isinstance(response, dict):
                 raise Exception(response)
+            self.request_client.viewer = response
             return response
         except:
             logger.info("Guest Session")
@@ -182,33 +269,12 @@ class TweeterPy:
         """
         try:
             logger.debug("Trying to generate a new session.")
-            self.request_client = RequestClient(
-                session=curl_cffi.Session(impersonate="chrome"))
+            self.request_client = bootstrap_session(
+                proxies=self.proxies, hooks=self.hooks, cache=self.cache, recorder=self.recorder)
             session = self.request_client.session
-            if self.proxies:
-                session.proxies = self.proxies
-                session.verify = False
-            session.headers.update(util.generate_headers())
-            # home_page = self.request_client.request(Path.BASE_URL)
-            home_page = util.handle_x_migration(session=session)
-            ondemand_file_response = util.get_ondemand_file_response(
-                session=session, home_page=home_page)
-            self.request_client.client_transaction = ClientTransaction(
-                home_page_response=home_page, ondemand_file_response=ondemand_file_response)
-            try:
-                response = self.request_client.request(
-                    Path.GUEST_TOKEN_URL, method="POST")
-                if not response.get('guest_token'):
-                    logger.debug(response)
-                guest_token = response.get(
-                    'guest_token', util.find_guest_token(home_page))
-            except Exception as error:
-                logger.error(error)
-                raise
-            session.headers.update({'X-Guest-Token': guest_token})
-            session.cookies.update({'gt': guest_token})
             if auth_token:
                 session.cookies.update({'auth_token': auth_token})
+                self.request_client.refresh_auth_state()
                 util.generate_headers(session)
         except Exception as error:
             logger.exception(f"Couldn't generate a new session.\n{error}\n")
@@ -216,13 +282,14 @@ class TweeterPy:
         logger.debug("Session has been generated.")
         return self.session
 
-    def save_session(self, session=None, session_name=None, path=None):
+    def save_session(self, session=None, session_name=None, path=None, store=None):
         """Save a logged in session to avoid frequent logins in future.
 
         Args:
             session (requests.Session, optional): requests.Session object you want to save. If None, saves current session by default. Defaults to None. 
             session_name (str, optional): Session name. If None, uses currently logged in username. Defaults to None.
             path (str, optional): Session directory. If None, uses DEFAULT_SESSION_DIRECTORY from constants.py. Defaults to None.
+            store (SessionStore, optional): Save the session into a SessionStore (single file for multiple accounts) instead of a separate session file. Defaults to None.
 
         Returns:
             path: Saved session file path.
@@ -231,32 +298,43 @@ class TweeterPy:
             session = self.request_client.session
         if session_name is None:
             session_name = self.me['data']['viewer']['user_results']['result']['legacy']['screen_name']
+        if store is not None:
+            store.save(session_name, session)
+            return store.path
         return save_session(filename=session_name, path=path, session=session)
 
-    def load_session(self, path=None):
+    def load_session(self, path=None, session_name=None, store=None):
         """Load a saved session.
 
         Args:
             path (str, optional): Session file path. If None, shows a list of all saved session to choose from. Defaults to None.
+            session_name (str, optional): Name of the session to load from the store. Defaults to None.
+            store (SessionStore, optional): Load the session from a SessionStore instead of a session file. Defaults to None.
 
         Returns:
             requests.Session: Restored session.
         """
         session = self.generate_session()
-        self.request_client = RequestClient(
-            session=load_session(path=path, session=session))
+        if store is not None:
+            session = store.load(session_name, session=session)
+        else:
+            session = load_session(path=path, session=session)
+        self.request_client = RequestClient(session=session, hooks=self.hooks, cache=self.cache, recorder=self.recorder)
         return self.session
 
+    def _has_fresh_guest_session(self):
+        request_client = self.request_client
+        if request_client is None or request_client.bootstrapped_at is None or request_client.logged_in:
+            return False
+        return time.time() - request_client.bootstrapped_at < GUEST_TOKEN_TTL - GUEST_TOKEN_REFRESH_MARGIN
+
     def logged_in(self):
         """Check if the user is logged in.
 
         Returns:
             bool: Returns True if the user is logged in.
         """
-        if "auth_token" in self.request_client.session.cookies.keys():
-            # logger.info('User is authenticated.')
-            return True
-        return False
+        return self.request_client.logged_in
 
     def login(self, username=None, password=None, email=None, phone=None, mfa_secret=None, **kwargs):
         """Log into an account.
@@ -267,14 +345,22 @@ class TweeterPy:
             email (str, optional): Twitter email. Defaults to None.
             phone (str, optional): Twitter phone. Defaults to None.
             mfa_secret (str, optional): Twitter MFA Secret Token to generate TOTP code. Defaults to None.
+            code_callback (callable, optional): Keyword argument. code_callback(username, task_id, message) returns the verification codes (ACID etc) instead of asking for them with input(). Defaults to None.
         """
-        self.generate_session()
+        # Reuse the warm guest session (bootstrap done by the constructor) instead of bootstrapping a new one.
+        if not self._has_fresh_guest_session():
+            self.generate_session()
         if username is None:
             username = str(input("Enter Your Username or Email : ")).strip()
         if password is None:
             password = getpass.getpass()
-        TaskHandler(request_client=self.request_client).login(
-            username, password, email=email, phone=phone, mfa_secret=mfa_secret, **kwargs)
+        try:
+            TaskHandler(request_client=self.request_client).login(
+                username, password, email=email, phone=phone, mfa_secret=mfa_secret, **kwargs)
+        finally:
+            # The session went through a login flow, the next login bootstraps a new one.
+            self.request_client.bootstrapped_at = None
+        self.request_client.refresh_auth_state()
         util.generate_headers(session=self.request_client.session)
         try:
             user = self.me
@@ -320,7 +406,7 @@ class TweeterPy:
         variables = {"userId": user_id, "withSafetyModeUserFields": True}
         request_payload = self._generate_request_data(
             Path.USER_INFO_ENDPOINT, variables, user_data_features=True)
-        response = self.request_client.request(**request_payload)
+        response = self._lookup(request_payload)
         return response['data']['user']['result']
 
     def get_user_data(self, username):
@@ -335,7 +421,7 @@ class TweeterPy:
         variables = {"screen_name": username, "withSafetyModeUserFields": True}
         request_payload = self._generate_request_data(
             Path.USER_DATA_ENDPOINT, variables, user_info_feautres=True)
-        response = self.request_client.request(**request_payload)
+        response = self._lookup(request_payload)
         return response['data']['user']['result']
 
     @login_decorator
@@ -354,7 +440,7 @@ class TweeterPy:
         response = self.request_client.request(**request_payload)
         return response['data']['users']
 
-    def get_user_tweets(self, user_id, with_replies=False, end_cursor=None, total=None, pagination=True):
+    def get_user_tweets(self, user_id, with_replies=False, end_cursor=None, total=None, pagination=True, page_size=None, since_id=None, stop_condition=None, deduplicate=True):
         """Get Tweets from a user's profile.
 
         Args:
@@ -363,6 +449,10 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            since_id (str/int, optional): Stop at the first tweet with an id lower than or equal to since_id (i.e. the newest tweet id of the previous run), so only the newer tweets are fetched. Defaults to None.
+            stop_condition (callable, optional): Called with every timeline entry, pagination stops as soon as it returns True (the entry is not included). i.e. util.created_before("2026-01-01"), util.id_below(tweet_id) or a custom function. Defaults to None.
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -383,10 +473,10 @@ class TweeterPy:
             query_endpoint, variables, additional_features=True)
         data_path = ('data', 'user', 'result', 'timeline',
                      'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, since_id=since_id, stop_condition=stop_condition, deduplicate=deduplicate)
 
     @login_decorator
-    def get_user_media(self, user_id, end_cursor=None, total=None, pagination=True):
+    def get_user_media(self, user_id, end_cursor=None, total=None, pagination=True, page_size=None, since_id=None, stop_condition=None, deduplicate=True):
         """Get media from a user's profile.
 
         Args:
@@ -394,6 +484,10 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            since_id (str/int, optional): Stop at the first tweet with an id lower than or equal to since_id (i.e. the newest tweet id of the previous run), so only the newer tweets are fetched. Defaults to None.
+            stop_condition (callable, optional): Called with every timeline entry, pagination stops as soon as it returns True (the entry is not included). i.e. util.created_before("2026-01-01"), util.id_below(tweet_id) or a custom function. Defaults to None.
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -405,7 +499,7 @@ class TweeterPy:
             Path.USER_MEDIA_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'user', 'result', 'timeline_v2',
                      'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, since_id=since_id, stop_condition=stop_condition, deduplicate=deduplicate)
 
     def get_tweet(self, tweet_id, with_tweet_replies=False, end_cursor=None, total=None, pagination=True):
         """Get Tweets from a user's profile.
@@ -424,28 +518,29 @@ class TweeterPy:
             logger.exception(
                 "Either set with_tweet_replies to True or end_cursor to None.")
             raise
+        if with_tweet_replies and not self.logged_in():
+            self.login()
+        logged_in = self.logged_in()
         referer = 'tweet' if with_tweet_replies else random.choice(
             ['profile', 'home'])
         variables = {"focalTweetId": tweet_id, "referrer": referer, "with_rux_injections": False, "includePromotedContent": True,
                      "withCommunity": True, "withQuickPromoteEligibilityTweetFields": True, "withArticleRichContent": False, "withBirdwatchNotes": False,
                      "withVoice": True, "withV2Timeline": True}
-        variables = variables if self.logged_in() else {
+        variables = variables if logged_in else {
             "tweetId": tweet_id, "withCommunity": False, "includePromotedContent": False, "withVoice": False}
         request_payload = self._generate_request_data(
             Path.TWEET_DETAILS_ENDPOINT, variables, additional_features=True)
-        if not self.logged_in():
+        if not logged_in:
             request_payload['url'] = request_payload.get('url').replace(
                 Path.TWEET_DETAILS_ENDPOINT, Path.TWEET_DETAILS_BY_ID)
         if with_tweet_replies:
-            if not self.logged_in():
-                self.login()
             data_path = (
                 'data', 'threaded_conversation_with_injections_v2', 'instructions')
             return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
-        return self.request_client.request(**request_payload)
+        return self._lookup(request_payload)
 
     @login_decorator
-    def get_liked_tweets(self, user_id, end_cursor=None, total=None, pagination=True):
+    def get_liked_tweets(self, user_id, end_cursor=None, total=None, pagination=True, page_size=None, deduplicate=True):
         """Get Tweets liked by a user.
 
         Args:
@@ -453,6 +548,8 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -464,16 +561,18 @@ class TweeterPy:
             Path.LIKED_TWEETS_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'user', 'result', 'timeline_v2',
                      'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, deduplicate=deduplicate)
 
     @login_decorator
-    def get_user_timeline(self, end_cursor=None, total=None, pagination=True):
+    def get_user_timeline(self, end_cursor=None, total=None, pagination=True, page_size=None, deduplicate=True):
         """Get tweets from home timeline (Home Page).
 
         Args:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -483,10 +582,10 @@ class TweeterPy:
         request_payload = self._generate_request_data(
             Path.HOME_TIMELINE_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'home', 'home_timeline_urt', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, deduplicate=deduplicate)
 
     @login_decorator
-    def get_list_tweets(self, list_id, end_cursor=None, total=None, pagination=True):
+    def get_list_tweets(self, list_id, end_cursor=None, total=None, pagination=True, page_size=None, since_id=None, stop_condition=None, deduplicate=True):
         """Get tweets from a Tweets List.
 
         Args:
@@ -494,6 +593,10 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            since_id (str/int, optional): Stop at the first tweet with an id lower than or equal to since_id (i.e. the newest tweet id of the previous run), so only the newer tweets are fetched. Defaults to None.
+            stop_condition (callable, optional): Called with every timeline entry, pagination stops as soon as it returns True (the entry is not included). i.e. util.created_before("2026-01-01"), util.id_below(tweet_id) or a custom function. Defaults to None.
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -503,10 +606,10 @@ class TweeterPy:
             Path.TWEETS_LIST_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'list', 'tweets_timeline',
                      'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, since_id=since_id, stop_condition=stop_condition, deduplicate=deduplicate)
 
     @login_decorator
-    def get_topic_tweets(self, topic_id, end_cursor=None, total=None, pagination=True):
+    def get_topic_tweets(self, topic_id, end_cursor=None, total=None, pagination=True, page_size=None, deduplicate=True):
         """Get tweets from a Topic.
 
         Args:
@@ -514,6 +617,8 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -523,10 +628,10 @@ class TweeterPy:
             Path.TOPIC_TWEETS_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'topic_by_rest_id', 'topic_page',
                      'body', 'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, deduplicate=deduplicate)
 
     @login_decorator
-    def search(self, search_query, end_cursor=None, total=None, search_filter=None, pagination=True):
+    def search(self, search_query, end_cursor=None, total=None, search_filter=None, pagination=True, page_size=None, since_id=None, stop_condition=None, deduplicate=True):
         """Get search results.
 
         Args:
@@ -535,6 +640,10 @@ class TweeterPy:
             total (int, optional): Total(Max) Number of results you want to get. If None, extracts all results. Defaults to None.
             search_filter (str, optional): Type of search you want to perform. Available filters - Latest , Top , People , Photos , Videos. Defaults to 'Top'.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            since_id (str/int, optional): Stop at the first tweet with an id lower than or equal to since_id (i.e. the newest tweet id of the previous run), so only the newer tweets are fetched. Defaults to None.
+            stop_condition (callable, optional): Called with every timeline entry, pagination stops as soon as it returns True (the entry is not included). i.e. util.created_before("2026-01-01"), util.id_below(tweet_id) or a custom function. Defaults to None.
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -548,10 +657,10 @@ class TweeterPy:
             Path.SEARCH_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'search_by_raw_query',
                      'search_timeline', 'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, since_id=since_id, stop_condition=stop_condition, deduplicate=deduplicate)
 
     @login_decorator
-    def get_friends(self, user_id, follower=False, following=False, mutual_follower=False, end_cursor=None, total=None, pagination=True):
+    def get_friends(self, user_id, follower=False, following=False, mutual_follower=False, end_cursor=None, total=None, pagination=True, page_size=None, deduplicate=True):
         """Get User's follower, followings or mutual followers.
 
         Args:
@@ -562,6 +671,8 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -578,7 +689,7 @@ class TweeterPy:
             query_path, variables, additional_features=True)
         data_path = ('data', 'user', 'result', 'timeline',
                      'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, deduplicate=deduplicate)
 
     @login_decorator
     def get_profile_business_category(self, user_id):
@@ -598,7 +709,7 @@ class TweeterPy:
         return response
 
     @login_decorator
-    def get_tweet_likes(self, tweet_id, end_cursor=None, total=None, pagination=True):
+    def get_tweet_likes(self, tweet_id, end_cursor=None, total=None, pagination=True, page_size=None, deduplicate=True):
         """Returns data about the users who liked the given tweet post.
 
         Args:
@@ -606,6 +717,8 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -615,10 +728,10 @@ class TweeterPy:
         request_payload = self._generate_request_data(
             Path.TWEET_LIKES_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'favoriters_timeline', 'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, deduplicate=deduplicate)
 
     @login_decorator
-    def get_retweeters(self, tweet_id, end_cursor=None, total=None, pagination=True):
+    def get_retweeters(self, tweet_id, end_cursor=None, total=None, pagination=True, page_size=None, deduplicate=True):
         """Returs data about the users who retweeted the given tweet post.
 
         Args:
@@ -626,6 +739,8 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -635,9 +750,9 @@ class TweeterPy:
         request_payload = self._generate_request_data(
             Path.RETWEETED_BY_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'retweeters_timeline', 'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, deduplicate=deduplicate)
 
-    def get_user_highlights(self, user_id, end_cursor=None, total=None, pagination=True):
+    def get_user_highlights(self, user_id, end_cursor=None, total=None, pagination=True, page_size=None, deduplicate=True):
         """Get highlights from a user's profile.
 
         Args:
@@ -645,6 +760,8 @@ class TweeterPy:
             end_cursor (str, optional): Last endcursor point. (To start from where you left off last time). Defaults to None.
             total (int, optional): Total(Max) number of results you want to get. If None, extracts all results. Defaults to None.
             pagination (bool, optional): Set to False if want to handle each page request manually. Use end_cursor from the previous page/request to navigate to the next page. Defaults to True.
+            page_size (int/str, optional): Number of results to request per page. Set to "auto" to use the largest page size the API accepts for this endpoint (learned from the responses and cached per operation). Defaults to None (endpoint's default page size).
+            deduplicate (bool/set, optional): Skip the tweets/users already returned on the previous pages, so total counts the unique results. Pass a set-like object (i.e. util.BloomFilter for huge crawls) to use it for the seen keys. Defaults to True.
 
         Returns:
             dict: Returns data, cursor_endpoint, has_next_page
@@ -656,7 +773,7 @@ class TweeterPy:
             Path.USER_HIGHLIGHTS_ENDPOINT, variables, additional_features=True)
         data_path = ('data', 'user', 'result', 'timeline',
                      'timeline', 'instructions')
-        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination)
+        return self._handle_pagination(**request_payload, end_cursor=end_cursor, data_path=data_path, total=total, pagination=pagination, page_size=page_size, deduplicate=deduplicate)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,19 @@
 import os
 import re
 import json
+import time
 import tempfile
-import demjson3
-import logging.config
+import threading
+from urllib.parse import urlparse
+from tweeterpy import util
 from tweeterpy.utils.request import RequestClient
-from tweeterpy.constants import Path, FeatureSwitch, API_TMP_FILE, LOGGING_CONFIG
+from tweeterpy.utils.logging import get_logger
+from tweeterpy.constants import Path, FeatureSwitch, API_TMP_FILE
 
-logging.config.dictConfig(LOGGING_CONFIG)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 dataset_regex = re.compile(
     r'''exports\s*=\s*{((.*?)(queryId)(.*?))},''', re.VERBOSE)
-api_file_regex = re.compile(r'''api:(.*?),''', re.VERBOSE)
-main_file_regex = re.compile(r'''main(.?)(\w*).?js''', re.VERBOSE)
-feature_switch_regex = re.compile(r'''.featureSwitch.:(.*?)}},''', re.VERBOSE)
 # logging.basicConfig(level=logging.DEBUG,
 #                     format='%(asctime)s [%(levelname)s] %(module)s : %(funcName)s : %(lineno)d ::: %(message)s')
 
@@ -24,8 +23,19 @@ class ApiUpdater:
         Twitter updates its API quite frequently. Therefore, ApiUpdater checks for the latest updates and modifies the api_endpoints, feature_switches, path etc in constants.py
     """
 
-    def __init__(self, request_client: RequestClient = None, restore_cache: bool = False):
+    def __init__(self, request_client: RequestClient = None, restore_cache: bool = False, home_page_data: dict = None, endpoints_only: bool = False, operations: list = None):
+        """
+        Args:
+            request_client (RequestClient, optional): RequestClient object. Defaults to None.
+            restore_cache (bool, optional): Restore the offline (cached/old) version of the API data instead of the online (latest) version. Defaults to False.
+            home_page_data (dict, optional): util.scan_home_page data of an already downloaded home page (i.e. by the session bootstrap). If None, downloads the home page. Defaults to None.
+            endpoints_only (bool, optional): Only refresh the endpoints (queryIds), i.e. after a stale queryId. The main bundle is only downloaded if one of the operations isn't in the api bundle. Defaults to False.
+            operations (list, optional): Operations (i.e. ["UserTweets"]) which must be refreshed, with endpoints_only. Defaults to None.
+        """
         self.request_client = request_client
+        if endpoints_only:
+            self._refresh_endpoints(home_page_data, operations)
+            return
         try:
             logger.debug('Updating API...')
             # fmt: off - Turns off formatting for this block of code.
@@ -33,10 +43,11 @@ class ApiUpdater:
                 if restore_cache:
                     raise Exception("Skipping API Updates.")
                 api_files_data = []
-                page_source = self._get_home_page_source()
-                api_file_url = self._get_api_file_url(page_source)
-                main_file_url = self._get_main_file_url(page_source)
-                feature_switches = self._get_feature_switches(page_source)
+                if home_page_data is None:
+                    home_page_data = self._get_home_page_data()
+                api_file_url = self._get_api_file_url(home_page_data)
+                main_file_url = self._get_main_file_url(home_page_data)
+                feature_switches = self._get_feature_switches(home_page_data)
                 if api_file_url:
                     api_files_data.append(self._get_api_file_content(api_file_url))
                 if main_file_url:
@@ -59,28 +70,30 @@ class ApiUpdater:
             raise
             # fmt: on 
 
-    def _get_home_page_source(self):
-        return str(self.request_client.request(Path.BASE_URL))
+    def _get_home_page_data(self):
+        return util.scan_home_page(str(self.request_client.request(Path.BASE_URL)))
 
-    def _get_api_file_url(self, page_source=None):
-        if page_source is None:
-            page_source = self._get_home_page_source()
+    def _get_api_file_url(self, home_page_data=None):
+        if home_page_data is None:
+            home_page_data = self._get_home_page_data()
         try:
-            api_file_name = re.search(api_file_regex, page_source).group(1)
+            api_file_name = home_page_data["api_file_name"]
             api_file_url = f"{Path.TWITTER_CDN}/api.{eval(api_file_name)}a.js"
-            logger.debug(f"API Url => {api_file_url}")
+            logger.debug("API Url => %s", api_file_url)
         except Exception as error:
             # logger.exception(f"Couldn't get the API file Url.\n{error}")
             return None
         return api_file_url
 
-    def _get_main_file_url(self, page_source=None):
-        if page_source is None:
-            page_source = self._get_home_page_source()
+    def _get_main_file_url(self, home_page_data=None):
+        if home_page_data is None:
+            home_page_data = self._get_home_page_data()
         try:
-            main_file_name = re.search(main_file_regex, page_source).group(0)
+            main_file_name = home_page_data["main_file_name"]
+            if main_file_name is None:
+                raise Exception("main file not found on the home page.")
             main_file_url = f"{Path.TWITTER_CDN}/{main_file_name}"
-            logger.debug(f"Main File Url => {main_file_url}")
+            logger.debug("Main File Url => %s", main_file_url)
         except Exception as error:
             logger.exception(f"Couldn't get the main file Url.\n{error}")
             return None
@@ -97,6 +110,7 @@ class ApiUpdater:
         return str(self.request_client.request(file_url))
 
     def _js_to_py_dict(sel, page_source):
+        import demjson3
         if isinstance(page_source, list):
             page_source = "\n".join([str(item) for item in page_source])
         else:
@@ -120,6 +134,44 @@ class ApiUpdater:
                                 if value.split("/")[-1] == new_key})
         return mapped_data
 
+    def _refresh_endpoints(self, home_page_data=None, operations=None):
+        if home_page_data is None:
+            home_page_data = self._get_home_page_data()
+        api_files_data = []
+        api_file_url = self._get_api_file_url(home_page_data)
+        if api_file_url:
+            api_files_data.append(self._get_api_file_content(api_file_url))
+        endpoints_data = self._js_to_py_dict(api_files_data)
+        found_operations = {endpoint['operationName'] for endpoint in endpoints_data}
+        # The main bundle is several MBs, skip it if the api bundle has every operation we need.
+        if not operations or not set(operations).issubset(found_operations):
+            main_file_url = self._get_main_file_url(home_page_data)
+            if main_file_url:
+                endpoints_data.extend(self._js_to_py_dict([self._get_main_file_content(main_file_url)]))
+        if not endpoints_data:
+            raise Exception("Couldn't get the API endpoints.")
+        # Merge into the current endpoints (only a part of the bundles may have been downloaded).
+        FeatureSwitch.api_endpoints.update({
+            f"{endpoint['queryId']}/{endpoint['operationName']}": endpoint for endpoint in endpoints_data})
+        new_endpoints = {
+            endpoint['operationName']: f"{endpoint['queryId']}/{endpoint['operationName']}" for endpoint in endpoints_data}
+        updated_endpoints = {key: new_endpoints[value.split("/")[-1]] for key, value in self._get_current_api_endpoints().items()
+                             if isinstance(value, str) and value.split("/")[-1] in new_endpoints and value != new_endpoints[value.split("/")[-1]]}
+        self._update_api_endpoints(updated_endpoints)
+        self._update_saved_endpoints(endpoints_data)
+        logger.info(f"{len(updated_endpoints)} API endpoints refreshed.")
+        return updated_endpoints
+
+    def _update_saved_endpoints(self, endpoints_data):
+        # So the next runs don't restore the stale queryIds from the backup file.
+        try:
+            feature_switches, saved_endpoints_data = self._load_api_data()
+        except Exception:
+            return
+        endpoints = {endpoint['operationName']: endpoint for endpoint in saved_endpoints_data}
+        endpoints.update({endpoint['operationName']: endpoint for endpoint in endpoints_data})
+        self._save_api_data(feature_switches, list(endpoints.values()))
+
     def _get_current_api_endpoints(self):
         api_endpoints = {}
         for key, value in Path.__dict__.items():
@@ -131,11 +183,10 @@ class ApiUpdater:
         for key, value in new_endpoints.items():
             setattr(Path, key, value)
 
-    def _get_feature_switches(self, page_source=None):
-        if page_source is None:
-            self._get_home_page_source()
-        feature_switch_data = re.search(
-            feature_switch_regex, str(page_source)).group(0)
+    def _get_feature_switches(self, home_page_data=None):
+        if home_page_data is None:
+            home_page_data = self._get_home_page_data()
+        feature_switch_data = home_page_data["feature_switches"]
         return json.loads("{"+feature_switch_data.rstrip(',')+"}}")
 
     def _update_feature_switches(self, feature_switches=None):
@@ -181,5 +232,83 @@ class ApiUpdater:
         return feature_switches, endpoints
 
 
+def get_current_endpoint(operation):
+    """Returns the current endpoint (queryId/operationName) of an operation from Path, None if unknown."""
+    for key, value in vars(Path).items():
+        if key.endswith(("_ENDPOINT", "_BY_ID")) and isinstance(value, str) and value.split("/")[-1] == operation:
+            return value
+    return None
+
+
+class StaleEndpointHealer:
+    """
+        Recovers from the stale queryIds (X rotates them from time to time) : refreshes the endpoints once and returns the url with the new queryId to retry the failed request.
+        The refresh is shared by the concurrent failures (they wait for it and reuse its result). If a successful refresh doesn't change the queryId, the circuit opens and the failures are raised right away for cooldown seconds, instead of refreshing again and again.
+    """
+
+    def __init__(self, cooldown=300):
+        """
+        Args:
+            cooldown (int, optional): Seconds without any refresh after a refresh which didn't help. Defaults to 300.
+        """
+        self.cooldown = cooldown
+        self.refresh_count = 0
+        self._open_until = 0
+        # End time of the last failed refresh. The failures which were already waiting for it don't refresh again.
+        self._refresh_failed_at = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return time.time() < self._open_until
+
+    def heal(self, request_client, url, params=None):
+        """Returns the url with the current queryId of its operation (and the params with its features), refreshing the endpoints if needed.
+
+        Args:
+            request_client (RequestClient): RequestClient of the failed request, used to download the bundles.
+            url (str): GraphQL url with the stale queryId.
+            params (dict, optional): Query params of the failed request. Defaults to None.
+
+        Returns:
+            tuple: (url, params) to retry the request with, None if it couldn't be healed.
+        """
+        path = urlparse(url).path.rstrip("/")
+        stale_endpoint = "/".join(path.split("/")[-2:])
+        operation = stale_endpoint.split("/")[-1]
+        if get_current_endpoint(operation) is None:
+            return None
+        failed_at = time.time()
+        with self._lock:
+            current_endpoint = get_current_endpoint(operation)
+            if current_endpoint == stale_endpoint:
+                # Circuit open, or a refresh failed while this failure was waiting for it (one refresh per burst).
+                if self.is_open or failed_at <= self._refresh_failed_at:
+                    return None
+                logger.info(f"Stale queryId of {operation}, refreshing the API endpoints.")
+                try:
+                    ApiUpdater(request_client=request_client, endpoints_only=True, operations=[operation])
+                    self.refresh_count += 1
+                except Exception as error:
+                    # i.e. a network error while downloading the bundles, the next failures (not the waiting ones) try again.
+                    logger.warn(f"Couldn't refresh the API endpoints. {error}")
+                    self._refresh_failed_at = time.time()
+                    return None
+                current_endpoint = get_current_endpoint(operation)
+                # The refresh succeeded but didn't change the queryId.
+                if current_endpoint is None or current_endpoint == stale_endpoint:
+                    self._open_until = time.time() + self.cooldown
+                    return None
+        params = dict(params or {})
+        features = FeatureSwitch().get_query_features(current_endpoint) if "features" in params else None
+        if features:
+            params["features"] = json.dumps(features)
+        return url.replace(stale_endpoint, current_endpoint), params
+
+
+# Shared by every RequestClient, like the endpoints in Path.
+endpoint_healer = StaleEndpointHealer()
+
+
 if __name__ == "__main__":
     pass
@@ -1,19 +1,18 @@
 import os
 import re
-import bs4
+import math
 import time
+import hashlib
 import datetime
 import tempfile
-import logging.config
 from functools import reduce
 from typing import Dict, List
 from urllib.parse import urljoin
-from x_client_transaction.utils import get_ondemand_file_url
-from tweeterpy.constants import Path, PUBLIC_TOKEN, LOGGING_CONFIG, USER_AGENT, API_TMP_FILE
+from tweeterpy.utils.logging import get_logger
+from tweeterpy.constants import Path, PUBLIC_TOKEN, USER_AGENT, API_TMP_FILE
 from dataclasses import dataclass, field, fields, asdict, _MISSING_TYPE
 
-logging.config.dictConfig(LOGGING_CONFIG)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 class DotDict(dict):
@@ -45,14 +44,77 @@ def generate_headers(session=None, custom_headers=None):
         headers.update({"authorization": PUBLIC_TOKEN})
         headers.update(dict(session.headers))
         if "auth_token" in session.cookies.keys():
-            session.get(Path.BASE_URL)
-            csrf_token = session.cookies.get("ct0", None)
+            csrf_token = refresh_csrf_token(session)
             headers.update({"x-csrf-token": csrf_token,
                             "x-twitter-auth-type": "OAuth2Session"})
         session.headers.update(headers)
     return headers
 
 
+def get_cookie(cookies, name):
+    # Cookies.get raises CookieConflict if the same cookie is set for multiple domains. Returns the last one instead.
+    try:
+        return cookies.get(name, None)
+    except Exception:
+        values = [cookie.value for cookie in cookies.jar if cookie.name == name]
+        return values[-1] if values else None
+
+
+def delete_cookie(cookies, name):
+    # Removes the cookie from every domain/path it is set for.
+    for cookie in [cookie for cookie in cookies.jar if cookie.name == name]:
+        cookies.jar.clear(cookie.domain, cookie.path, cookie.name)
+
+
+def refresh_csrf_token(session, force=False):
+    """Sets the x-csrf-token header from the ct0 cookie. The home page is only fetched (to get a new ct0 cookie) if the cookie is missing or force is True.
+
+    Args:
+        session (Session): Session to refresh the csrf token of.
+        force (bool, optional): Fetch a new ct0 cookie even if there is one already, i.e. if the current one was rejected. Defaults to False.
+
+    Returns:
+        str: csrf token. None if no ct0 cookie could be fetched.
+    """
+    csrf_token = None if force else get_cookie(session.cookies, "ct0")
+    if not csrf_token:
+        if force:
+            # Drop the rejected token, so it can't be read back if the home page doesn't send a new one.
+            delete_cookie(session.cookies, "ct0")
+            session.headers.pop("x-csrf-token", None)
+        logger.debug("Fetching a new csrf token.")
+        session.get(Path.BASE_URL)
+        csrf_token = get_cookie(session.cookies, "ct0")
+    if csrf_token:
+        session.headers.update({"x-csrf-token": csrf_token})
+    return csrf_token
+
+
+def sync_csrf_token(session, response):
+    """Updates the x-csrf-token header if the response rotated the ct0 cookie (Set-Cookie). Only the response cookies are checked, not the whole cookie jar."""
+    if not response.cookies:
+        return None
+    csrf_token = get_cookie(response.cookies, "ct0")
+    if csrf_token and session.headers.get("x-csrf-token") != csrf_token:
+        session.headers.update({"x-csrf-token": csrf_token})
+    return csrf_token
+
+
+def is_csrf_token_rejected(response):
+    # Error code 353 - This request requires a matching csrf cookie and header.
+    return isinstance(response, dict) and any(isinstance(error, dict) and error.get("code") == 353
+                                              for error in response.get("errors") or [])
+
+
+# GraphQL validation error of the "count" variable, i.e. a page size over the max of the operation.
+page_size_error_regex = re.compile(r"\$?\bcount\b", re.IGNORECASE)
+
+
+def is_page_size_rejected(response):
+    return isinstance(response, dict) and not response.get("data") and any(
+        isinstance(error, dict) and page_size_error_regex.search(str(error.get("message") or "")) for error in response.get("errors") or [])
+
+
 def generate_features(default_features=True, user_data_features=False, user_info_feautres=False, additional_features=False):
     features = {}
     if default_features:
@@ -95,27 +157,71 @@ def find_guest_token(page_source):
     return guest_token
 
 
-def get_ondemand_file_response(session, home_page):
-    ondemand_file_url = get_ondemand_file_url(response=home_page)
+# Values of the home page needed by the session bootstrap and ApiUpdater.
+guest_token_regex = re.compile(r"""gt=(\d+);""")
+migration_url_regex = re.compile(r"""http(?:s)?://(?:www\.)?(?:twitter|x)\.com(?:/x)?/migrate[/?]?tok=[a-zA-Z0-9%\-_]+""")
+ondemand_file_index_regex = re.compile(r""",(\d+):["']ondemand\.s["']""")
+api_file_name_regex = re.compile(r"""api:(.*?),""")
+main_file_name_regex = re.compile(r"""main.?\w*.?js""")
+feature_switches_regex = re.compile(r""".featureSwitch.:(.*?)}},""")
+
+
+def scan_home_page(page_source):
+    """Extracts the bootstrap data of the x.com home page from its source, so the page is downloaded and decoded only once.
+
+    Args:
+        page_source (str): Home page source.
+
+    Returns:
+        dict: guest_token, migration_url, ondemand_file_hash, api_file_name, main_file_name and feature_switches (raw featureSwitch data). None if missing.
+    """
+    # Separate searches with a literal prefix are much faster than a single alternation scan with Python's re.
+    def search(regex, group=0):
+        match = regex.search(page_source)
+        return match.group(group) if match else None
+
+    ondemand_file_index = search(ondemand_file_index_regex, 1)
+    ondemand_file_hash = None
+    if ondemand_file_index:
+        ondemand_file_hash = search(re.compile(f',{ondemand_file_index}:"([0-9a-f]+)"'), 1)
+    return {"guest_token": search(guest_token_regex, 1), "migration_url": search(migration_url_regex),
+            "ondemand_file_hash": ondemand_file_hash, "api_file_name": search(api_file_name_regex, 1),
+            "main_file_name": search(main_file_name_regex), "feature_switches": search(feature_switches_regex)}
+
+
+def get_ondemand_file_response(session, home_page, home_page_data=None):
+    import x_client_transaction.utils
+    if home_page_data and home_page_data.get("ondemand_file_hash"):
+        ondemand_file_url = x_client_transaction.utils.ON_DEMAND_FILE_URL.format(filename=home_page_data["ondemand_file_hash"])
+    else:
+        ondemand_file_url = x_client_transaction.utils.get_ondemand_file_url(response=home_page)
     ondemand_file = session.request(url=ondemand_file_url, method="GET")
     ondemand_file_response = ondemand_file.text
     return ondemand_file_response
 
 
-def handle_x_migration(session):
-    home_page = None
-    migration_redirection_regex = re.compile(
-        r"""(http(?:s)?://(?:www\.)?(twitter|x){1}\.com(/x)?/migrate([/?])?tok=[a-zA-Z0-9%\-_]+)+""", re.VERBOSE)
+def handle_x_migration(session, return_page_data=False):
+    """Loads the home page, following the x.com migration redirection/form if any.
+
+    Args:
+        session (curl_cffi.Session): Session object.
+        return_page_data (bool, optional): Return the scan_home_page data of the home page as well (to share the page with ApiUpdater). Defaults to False.
+
+    Returns:
+        BeautifulSoup: Home page, or (home page, home page data) if return_page_data is True.
+    """
+    import bs4
+    home_page, home_page_data = None, None
     try:
         response = session.request(method="GET", url=Path.BASE_URL)
         home_page = bs4.BeautifulSoup(response.content, 'lxml')
-        migration_url = home_page.select_one("meta[http-equiv='refresh']")
-        migration_redirection_url = re.search(migration_redirection_regex, str(
-            migration_url)) or re.search(migration_redirection_regex, str(response.content))
-        if migration_redirection_url:
+        # The meta refresh tag is a part of the page source, a single scan covers both.
+        home_page_data = scan_home_page(response.text)
+        if home_page_data["migration_url"]:
             response = session.request(
-                method="GET", url=migration_redirection_url.group(0))
+                method="GET", url=home_page_data["migration_url"])
             home_page = bs4.BeautifulSoup(response.content, 'lxml')
+            home_page_data = scan_home_page(response.text)
         migration_form = home_page.select_one("form[name='f']") or home_page.select_one(
             f"form[action='{Path.X_MIGRATE_URL}']")
         if migration_form:
@@ -126,13 +232,26 @@ def handle_x_migration(session):
             response = session.request(
                 method=method, url=url, data=request_payload)
             home_page = bs4.BeautifulSoup(response.content, 'lxml')
+            home_page_data = scan_home_page(response.text)
     except Exception as error:
         logger.error(error)
     finally:
         generate_headers(session=session)
+        if return_page_data:
+            return home_page, home_page_data
         return home_page
 
 
+stale_query_regex = re.compile(r"query.{0,32}(?:not found|unspecified)|unknown query", re.IGNORECASE)
+
+
+def is_stale_query(url, response):
+    """Returns True if a GraphQL request failed because of an unknown (stale) queryId, i.e. 404 or a "query not found" error."""
+    if response.status_code < 400 or "/graphql/" not in url:
+        return False
+    return response.status_code == 404 or bool(stale_query_regex.search(response.text[:4096]))
+
+
 def check_for_errors(response):
     if not isinstance(response, dict):
         return response
@@ -202,6 +321,113 @@ def find_nested_key(dataset=None, nested_key=None):
     return [get_nested_data(data, nested_key, []) for data in dataset] if isinstance(dataset, list) else get_nested_data(dataset, nested_key, [])
 
 
+# Twitter snowflake ids epoch (in milliseconds).
+TWITTER_EPOCH_MS = 1288834974657
+
+tweet_entry_id_regex = re.compile(r"""(?:^|-)tweet-(\d+)""")
+
+
+def get_tweet_id(entry):
+    """Returns the tweet id (int) of a timeline entry. For modules (i.e. profile conversations), returns the newest tweet id in the module. None if the entry isn't a tweet."""
+    entry_ids = [entry.get('entryId', '')]
+    entry_ids.extend(item.get('entryId', '') for item in (entry.get('content') or {}).get('items') or [])
+    tweet_ids = [int(match.group(1)) for match in map(tweet_entry_id_regex.search, entry_ids) if match]
+    return max(tweet_ids) if tweet_ids else None
+
+
+entry_key_regex = re.compile(r"""(?:^|-)((?:tweet|user)-\d+)""")
+
+
+def get_entry_key(entry):
+    """Returns the de-duplication key of a timeline entry. i.e. "tweet-<id>"/"user-<id>", or the tweet/user keys of all the module items. Falls back to the entryId."""
+    entry_ids = [entry.get('entryId', '')]
+    entry_ids.extend(item.get('entryId', '') for item in (entry.get('content') or {}).get('items') or [])
+    keys = [match.group(1) for match in map(entry_key_regex.search, entry_ids) if match]
+    return ",".join(keys) if keys else entry_ids[0]
+
+
+class BloomFilter:
+    """
+        Bounded set of keys for de-duplicating huge crawls. Uses a fixed amount of memory (~1.2MB for 1M keys at 0.1% error rate), at the cost of false positives (a new key may be reported as seen) at the given error rate.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(str(key).encode(), digest_size=16).digest()
+        first_hash, second_hash = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first_hash + index * second_hash) % self.size for index in range(self.hash_count)]
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+
+def is_promoted_entry(entry):
+    item_content = (entry.get('content') or {}).get('itemContent') or {}
+    return entry.get('entryId', '').startswith('promoted-') or 'promotedMetadata' in item_content
+
+
+def tweet_id_to_datetime(tweet_id):
+    """Returns the creation time (UTC datetime) encoded in a (snowflake) tweet id."""
+    timestamp_ms = (int(tweet_id) >> 22) + TWITTER_EPOCH_MS
+    return datetime.datetime.fromtimestamp(timestamp_ms / 1000, tz=datetime.timezone.utc)
+
+
+def id_below(tweet_id, inclusive=False):
+    """Pagination stop condition. Stops at the first (non-promoted) tweet with an id lower than tweet_id.
+
+    Args:
+        tweet_id (str/int): Tweet ID.
+        inclusive (bool, optional): Stop at the tweet_id itself as well. Defaults to False.
+    """
+    tweet_id = int(tweet_id)
+
+    def stop_condition(entry):
+        entry_tweet_id = get_tweet_id(entry)
+        if entry_tweet_id is None or is_promoted_entry(entry):
+            return False
+        return entry_tweet_id <= tweet_id if inclusive else entry_tweet_id < tweet_id
+    return stop_condition
+
+
+def get_timestamp(date):
+    """Returns the unix timestamp (float, in seconds) of a date.
+
+    Args:
+        date (datetime/str/int/float): datetime object, ISO 8601 date string i.e. "2026-01-01" or unix timestamp. Naive dates are treated as UTC.
+    """
+    if isinstance(date, (int, float)):
+        return float(date)
+    if isinstance(date, str):
+        date = datetime.datetime.fromisoformat(date)
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return date.timestamp()
+
+
+def created_before(date):
+    """Pagination stop condition. Stops at the first (non-promoted) tweet created before the given date. The creation time is read from the tweet id, no date parsing needed.
+
+    Args:
+        date (datetime/str): datetime object or ISO 8601 date string i.e. "2026-01-01". Naive dates are treated as UTC.
+    """
+    # Smallest tweet id created at the given date.
+    first_tweet_id = max(0, int(get_timestamp(date) * 1000) - TWITTER_EPOCH_MS) << 22
+    return id_below(first_tweet_id)
+
+
 def update_required():
     try:
         current_time = datetime.datetime.now()
@@ -0,0 +1,224 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qsl
+from tweeterpy.utils.metrics import get_operation_name
+
+# Query params holding JSON, normalized (sorted keys) before hashing so the key doesn't depend on the serialization order.
+JSON_PARAMS = ("variables", "features", "fieldToggles")
+
+
+def _get_normalized_params(url, params=None):
+    all_params = dict(parse_qsl(urlparse(url).query))
+    all_params.update(params or {})
+    normalized_params = {}
+    for key, value in all_params.items():
+        if key in JSON_PARAMS and isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        normalized_params[key] = value
+    return normalized_params
+
+
+def is_first_page(url, params=None):
+    """Returns True for the first page (no cursor yet) of a paginated (timeline, search etc) request."""
+    variables = _get_normalized_params(url, params).get("variables")
+    return isinstance(variables, dict) and "count" in variables and not variables.get("cursor")
+
+
+def get_cache_key(method, url, params=None, scope=None):
+    """Returns the cache key of a request. Built from the method, url (without the query) and the normalized query params. scope separates the responses of different accounts."""
+    parsed_url = urlparse(url)
+    normalized_params = _get_normalized_params(url, params)
+    key_data = json.dumps([method.upper(), f"{parsed_url.netloc}{parsed_url.path}", normalized_params, scope], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+        Base class of the response caches. Caches the decoded (JSON) responses of the GET requests (without the api_rate_limit data) for a per-operation TTL, so the repeated lookups don't cost any API quota.
+        The first pages of the timelines and searches (newest entries) are only cached for the operations listed in operation_ttls, so the incremental syncs never get a stale first page.
+        Subclasses implement _get, _set and clear.
+    """
+
+    def __init__(self, ttl=300, operation_ttls=None, methods=("GET",)):
+        """
+        Args:
+            ttl (int, optional): Default time to live (in seconds) of the cached responses, except the first pages of the timelines and searches. 0/None disables caching for the operations not in operation_ttls. Defaults to 300.
+            operation_ttls (dict, optional): TTLs per operation. i.e. {"UserByScreenName": 3600, "SearchTimeline": 0}. Defaults to None.
+            methods (tuple, optional): HTTP methods to cache. Defaults to ("GET",).
+        """
+        self.ttl = ttl
+        self.operation_ttls = dict(operation_ttls or {})
+        self.methods = tuple(method.upper() for method in methods)
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get_ttl(self, url, params=None):
+        operation = get_operation_name(url)
+        if operation in self.operation_ttls:
+            return self.operation_ttls[operation]
+        if is_first_page(url, params):
+            return 0
+        return self.ttl
+
+    def is_cacheable(self, method, url, params=None):
+        return method.upper() in self.methods and bool(self.get_ttl(url, params))
+
+    def get(self, key):
+        value = self._get(key)
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key, response, ttl):
+        response = {name: value for name, value in response.items() if name != "api_rate_limit"}
+        self._set(key, json.dumps(response, separators=(",", ":")), time.time() + ttl)
+
+    def stats(self):
+        """Returns hits, misses and hit_ratio."""
+        requests_count = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hits / requests_count if requests_count else 0.0}
+
+    @abstractmethod
+    def _get(self, key):
+        pass
+
+    @abstractmethod
+    def _set(self, key, value, expires_at):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+
+class MemoryCache(ResponseCache):
+    """In-memory LRU response cache, bounded by the number of entries and the total size of the responses."""
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, **kwargs):
+        """
+        Args:
+            max_entries (int, optional): Max number of cached responses. Defaults to 1024.
+            max_bytes (int, optional): Max total size of the cached (serialized) responses. Defaults to 64MB.
+            **kwargs: ttl, operation_ttls, methods. See ResponseCache.
+        """
+        super().__init__(**kwargs)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _pop(self, key):
+        value, _ = self._entries.pop(key)
+        self._size -= len(value)
+
+    def _set(self, key, value, expires_at):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (value, expires_at)
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class DiskCache(ResponseCache):
+    """SQLite response cache, shared between the processes/runs. Bounded by the total size of the responses, the least recently used ones are evicted first."""
+
+    def __init__(self, path="tweeterpy_cache.db", max_bytes=512 * 1024 * 1024, **kwargs):
+        """
+        Args:
+            path (str, optional): SQLite database file. Defaults to "tweeterpy_cache.db".
+            max_bytes (int, optional): Max total size of the cached (serialized) responses. Defaults to 512MB.
+            **kwargs: ttl, operation_ttls, methods. See ResponseCache.
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # fmt: off
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        # fmt: on
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _set(self, key, value, expires_at):
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        # fmt: off
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO responses (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                                     (key, value, len(value), expires_at, now))
+            self._connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+            total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            for evicted_key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+                if total_size <= self.max_bytes:
+                    break
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (evicted_key,))
+                total_size -= size
+        # fmt: on
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,138 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from tweeterpy.utils.metrics import get_operation_name
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestHedger:
+    """
+        Hedged requests for the single item lookups (get_user_data, get_tweet, get_user_info) : if a request hasn't answered within a percentile of the recent latencies of its operation, the same request is sent on a second session and the first answer wins.
+        The hedges are capped by a budget (a fraction of the requests), so the extra API quota stays bounded.
+    """
+
+    def __init__(self, percentile=95, budget=0.05, min_samples=20, window=200, min_delay=0.05, max_workers=16):
+        """
+        Args:
+            percentile (int, optional): Hedge after this percentile of the recent latencies of the operation. Defaults to 95.
+            budget (float, optional): Max hedges per request, i.e. 0.05 allows 5 extra requests per 100 requests. Defaults to 0.05.
+            min_samples (int, optional): Don't hedge an operation before having this many latency samples. Defaults to 20.
+            window (int, optional): Number of recent latencies kept per operation. Defaults to 200.
+            min_delay (float, optional): Never hedge before this many seconds. Defaults to 0.05.
+            max_workers (int, optional): Max concurrent requests (primary + hedged) sent by the hedger. Defaults to 16.
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self._latencies = {}
+        # Hedges earned by the requests (budget per request), capped to avoid bursts after a calm period.
+        self._tokens = 0.0
+        self._stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="RequestHedger")
+            return self._executor
+
+    def get_delay(self, operation):
+        """Returns the hedging delay (seconds) of an operation, None if there are not enough samples yet."""
+        with self._lock:
+            latencies = self._latencies.get(operation)
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            latencies = sorted(latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))
+        return max(self.min_delay, latencies[index])
+
+    def _add_latency(self, operation, latency):
+        with self._lock:
+            latencies = self._latencies.get(operation)
+            if latencies is None:
+                latencies = self._latencies[operation] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def _take_token(self):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._stats["hedged"] += 1
+            return True
+
+    def _send(self, request_client, payload):
+        started_at = time.perf_counter()
+        response = request_client.request(**payload)
+        # The cache hits (~0s) would pull the percentile down.
+        if not request_client.last_response_cached:
+            self._add_latency(get_operation_name(payload["url"]), time.perf_counter() - started_at)
+        return response
+
+    def request(self, request_client, get_hedge_client=None, **payload):
+        """Sends a request, hedged on a second session if it's slow.
+
+        Args:
+            request_client (RequestClient): Session of the primary request.
+            get_hedge_client (callable, optional): Returns the session of the hedged request (i.e. the next guest token of a GuestTokenPool). If None, the primary session is used again (on a new connection). Defaults to None.
+            **payload: RequestClient.request arguments (url, params etc).
+
+        Returns:
+            dict: Response of the first successful request.
+        """
+        with self._lock:
+            self._stats["requests"] += 1
+            self._tokens = min(self._tokens + self.budget, max(1.0, self.budget * self.window))
+        delay = self.get_delay(get_operation_name(payload["url"]))
+        if delay is None:
+            # Nothing to hedge (not enough samples yet), no need for a thread hop.
+            return self._send(request_client, payload)
+        executor = self._get_executor()
+        primary = executor.submit(self._send, request_client, payload)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_token():
+            return primary.result()
+        hedge_client = get_hedge_client() if get_hedge_client is not None else request_client
+        logger.debug("Hedging %s after %.3fs.", payload["url"], delay)
+        hedge = executor.submit(self._send, hedge_client, payload)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except Exception as future_error:
+                    error = future_error
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._stats["hedge_wins"] += 1
+                # The slower request keeps running in the background, its response is dropped.
+                return response
+        raise error
+
+    def stats(self):
+        """Returns requests, hedged, hedge_wins and the current delays per operation."""
+        with self._lock:
+            stats = dict(self._stats)
+            operations = list(self._latencies)
+        stats["delays"] = {operation: self.get_delay(operation) for operation in operations}
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,124 @@
+import time
+import threading
+from tweeterpy.utils.metrics import RequestHook
+from tweeterpy.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class _Limit:
+    # AIMD state of a single (session, operation) key.
+    def __init__(self, limit):
+        self.limit = float(limit)
+        self.in_flight = 0
+        self.requests = 0
+        self.overloads = 0
+        self.latency = None
+        self.baseline_latency = None
+        # Time of the last multiplicative decrease. The overloads of the requests started before it belong to the same congestion event.
+        self.cut_at = 0.0
+
+
+class AdaptiveConcurrencyLimiter(RequestHook):
+    """
+        Adaptive (AIMD) limit of the in-flight requests, per session and operation. Register it as a request hook : TweeterPy(hooks=[limiter]).
+        The limit grows additively (+1 per limit's worth of healthy responses) while the latency stays close to its baseline, and is cut multiplicatively (once per congestion event) on 429, 5xx, an exhausted rate limit or a transport error.
+        Requests over the limit wait in before_request until a slot is released.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=64, backoff=0.5, latency_tolerance=2.0, smoothing=0.2):
+        """
+        Args:
+            initial_limit (int, optional): Initial in-flight requests limit of a key. Defaults to 4.
+            min_limit (int, optional): Defaults to 1.
+            max_limit (int, optional): Defaults to 64.
+            backoff (float, optional): The limit is multiplied by it on overload. Defaults to 0.5.
+            latency_tolerance (float, optional): Responses slower than latency_tolerance times the baseline latency don't grow the limit. Defaults to 2.0.
+            smoothing (float, optional): Weight of the last response in the moving average latency. Defaults to 0.2.
+        """
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self._condition = threading.Condition()
+        self._limits = {}
+
+    def _get_key(self, event):
+        return (event.scope or "default", event.operation)
+
+    def before_request(self, event):
+        key = self._get_key(event)
+        with self._condition:
+            limit = self._limits.get(key)
+            if limit is None:
+                limit = self._limits[key] = _Limit(self.initial_limit)
+            while limit.in_flight >= int(limit.limit):
+                self._condition.wait()
+            limit.in_flight += 1
+        # Released once, by after_response or on_error (both may be called for the same request).
+        event.limiter_key = key
+
+    def _release(self, event, overloaded=False, healthy=False):
+        now = time.time()
+        key = getattr(event, "limiter_key", None)
+        if key is None:
+            return
+        event.limiter_key = None
+        latency = event.timings.get("total")
+        with self._condition:
+            limit = self._limits[key]
+            limit.in_flight -= 1
+            limit.requests += 1
+            if latency:
+                limit.latency = latency if limit.latency is None else limit.latency + self.smoothing * (latency - limit.latency)
+                # Slowly forgets the fastest latency, so the baseline follows a permanent change.
+                limit.baseline_latency = latency if limit.baseline_latency is None else min(latency, limit.baseline_latency * 1.01)
+            if overloaded:
+                limit.overloads += 1
+                # Cut once per congestion event, not once per in-flight request hitting it.
+                if (event.started_at or now) >= limit.cut_at:
+                    limit.limit = max(self.min_limit, limit.limit * self.backoff)
+                    limit.cut_at = now
+                    logger.debug("%s overloaded, concurrency limit cut to %s.", key, int(limit.limit))
+            elif healthy and limit.in_flight + 1 >= int(limit.limit) / 2:
+                # Only grow a limit which is actually used.
+                if not latency or not limit.baseline_latency or latency <= limit.baseline_latency * self.latency_tolerance:
+                    limit.limit = min(self.max_limit, limit.limit + 1 / limit.limit)
+            self._condition.notify_all()
+
+    def after_response(self, event):
+        rate_limit = event.rate_limit or {}
+        status_code = event.status_code or 0
+        overloaded = status_code == 429 or status_code >= 500 or bool(rate_limit.get("rate_limit_exhausted"))
+        self._release(event, overloaded=overloaded, healthy=status_code < 400)
+
+    def on_error(self, event):
+        # Only called before after_response for the transport errors (timeouts, connection errors), which are overloads too, and the interruptions.
+        self._release(event, overloaded=not isinstance(event.error, KeyboardInterrupt))
+
+    def snapshot(self):
+        """Returns the current state {(scope, operation): {limit, in_flight, requests, overloads, latency, baseline_latency}}."""
+        with self._condition:
+            return {key: {"limit": int(limit.limit), "in_flight": limit.in_flight, "requests": limit.requests, "overloads": limit.overloads,
+                          "latency": limit.latency, "baseline_latency": limit.baseline_latency}
+                    for key, limit in self._limits.items()}
+
+    def to_prometheus(self, prefix="tweeterpy"):
+        """Exports the current state in the Prometheus text exposition format."""
+        # fmt: off - Turns off formatting for this block of code. Just for the readability purpose.
+        lines = []
+        snapshot = self.snapshot()
+        for name, metric_type, description in (("limit", "gauge", "Adaptive in-flight requests limit."),
+                                               ("in_flight", "gauge", "In-flight requests."),
+                                               ("overloads", "counter", "Responses which cut the limit (429, 5xx, exhausted rate limit).")):
+            lines.append(f"# HELP {prefix}_concurrency_{name} {description}")
+            lines.append(f"# TYPE {prefix}_concurrency_{name} {metric_type}")
+            lines.extend(f'{prefix}_concurrency_{name}{{scope="{scope}",operation="{operation}"}} {state[name]}' for (scope, operation), state in snapshot.items())
+        # fmt: on
+        return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    pass
@@ -1,5 +1,21 @@
+import atexit
 import logging
-from tweeterpy.constants import Color
+import threading
+import logging.config
+import logging.handlers
+from queue import SimpleQueue
+from functools import wraps
+from contextlib import contextmanager
+from tweeterpy.constants import Color, LOGGING_CONFIG
+
+# Parent logger of all the tweeterpy module loggers.
+LIBRARY_LOGGER_NAME = "tweeterpy"
+
+# {logger_name: QueueListener} - Active listeners while the queue logging is enabled.
+_queue_listeners = {}
+
+_logging_configured = False
+_logging_lock = threading.Lock()
 
 
 class CustomFormatter(logging.Formatter):
@@ -15,39 +31,160 @@ class CustomFormatter(logging.Formatter):
         FORMATS[log_level] = "%(asctime)s [{}] :: %(message)s".format(
             log_format)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Formatters are built once instead of once per log record.
+        self._formatters = {log_level: logging.Formatter(log_format)
+                            for log_level, log_format in self.FORMATS.items()}
+        self._default_formatter = logging.Formatter()
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self._formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
 
 
+def enable_queue_logging(logger_names=None):
+    """Moves the handlers of the given loggers behind a QueueHandler, so the (file/console) logging I/O runs on a background QueueListener thread instead of the request thread.
+
+    Args:
+        logger_names (list, optional): Names of the loggers whose handlers should be queued. Defaults to root and __main__ loggers (see LOGGING_CONFIG).
+    """
+    if logger_names is None:
+        logger_names = ["", "__main__"]
+    for logger_name in logger_names:
+        if logger_name in _queue_listeners:
+            continue
+        current_logger = logging.getLogger(logger_name)
+        handlers = [handler for handler in current_logger.handlers
+                    if not isinstance(handler, logging.handlers.QueueHandler)]
+        if not handlers:
+            continue
+        log_queue = SimpleQueue()
+        for handler in handlers:
+            current_logger.removeHandler(handler)
+        current_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _queue_listeners[logger_name] = listener
+    atexit.unregister(disable_queue_logging)
+    atexit.register(disable_queue_logging)
+
+
+def disable_queue_logging():
+    """Flushes the queued log records and restores the original handlers."""
+    while _queue_listeners:
+        logger_name, listener = _queue_listeners.popitem()
+        listener.stop()
+        current_logger = logging.getLogger(logger_name)
+        for handler in current_logger.handlers[:]:
+            if isinstance(handler, logging.handlers.QueueHandler):
+                current_logger.removeHandler(handler)
+        for handler in listener.handlers:
+            current_logger.addHandler(handler)
+
+
+def configure_logging(config=None, force=False):
+    """Applies the logging configuration (LOGGING_CONFIG by default) once per process. Called by the TweeterPy constructor, call it yourself when using the other modules standalone.
+
+    Args:
+        config (dict, optional): dictConfig compatible configuration. Defaults to LOGGING_CONFIG.
+        force (bool, optional): Apply the configuration again even if it was already applied. Defaults to False.
+
+    Returns:
+        bool: True if the configuration was applied.
+    """
+    global _logging_configured
+    with _logging_lock:
+        if _logging_configured and not force:
+            return False
+        logging.config.dictConfig(config or LOGGING_CONFIG)
+        _logging_configured = True
+        return True
+
+
 def set_log_level(log_level=None, return_loggers=False, external_only=False):
+    """Sets the log level of the tweeterpy logger hierarchy. Module loggers inherit it, so no other logger is touched.
+
+    Args:
+        log_level (str/int, optional): Logging level : "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL". Defaults to ERROR.
+        return_loggers (bool, optional): Return the previous levels, {logger_name: level}. Defaults to False.
+        external_only (bool, optional): Set the level of every non-tweeterpy logger in the process instead (walks all the loggers). Defaults to False.
+    """
     if log_level and log_level not in logging._levelToName and log_level not in logging._levelToName.values():
         raise Exception("Invalid Log Level")
     if log_level is None:
         log_level = logging.ERROR
     all_loggers = {}
-    for logger_name in logging.root.manager.loggerDict.keys():
-        if external_only and logger_name.startswith("tweeterpy"):
-            continue
-        current_logger = logging.getLogger(logger_name)
-        all_loggers[logger_name] = current_logger.level
-        current_logger.setLevel(log_level)
+    if external_only:
+        for logger_name in list(logging.root.manager.loggerDict.keys()):
+            if logger_name.startswith(LIBRARY_LOGGER_NAME):
+                continue
+            current_logger = logging.getLogger(logger_name)
+            all_loggers[logger_name] = current_logger.level
+            current_logger.setLevel(log_level)
+    else:
+        library_logger = logging.getLogger(LIBRARY_LOGGER_NAME)
+        all_loggers[LIBRARY_LOGGER_NAME] = library_logger.level
+        library_logger.setLevel(log_level)
     if return_loggers:
         return all_loggers
 
 
+class LogSuppressionFilter(logging.Filter):
+    """Drops records below the suppressed level while suppress_logs is active in the current thread. Other threads are not affected."""
+
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+
+    def _get_levels(self):
+        levels = getattr(self._local, "levels", None)
+        if levels is None:
+            levels = self._local.levels = []
+        return levels
+
+    def push(self, log_level):
+        self._get_levels().append(log_level)
+
+    def pop(self):
+        self._get_levels().pop()
+
+    def filter(self, record):
+        levels = getattr(self._local, "levels", None)
+        return not levels or record.levelno >= levels[-1]
+
+
+_suppression_filter = LogSuppressionFilter()
+
+
+def get_logger(name):
+    """Returns a logger with the log suppression filter attached. Used by tweeterpy modules instead of logging.getLogger."""
+    current_logger = logging.getLogger(name)
+    if _suppression_filter not in current_logger.filters:
+        current_logger.addFilter(_suppression_filter)
+    return current_logger
+
+
+@contextmanager
+def suppress_logs(log_level=logging.ERROR):
+    """Suppresses tweeterpy log records below log_level in the current thread, i.e. to keep credentials out of debug logs. Thread-safe and nestable.
+
+    Args:
+        log_level (int, optional): Records below this level are dropped. Defaults to logging.ERROR.
+    """
+    _suppression_filter.push(log_level)
+    try:
+        yield
+    finally:
+        _suppression_filter.pop()
+
+
 def disable_logger(original_function):
+    @wraps(original_function)
     def wrapper(*args, **kwargs):
-        all_loggers = set_log_level(logging.ERROR, return_loggers=True)
-        try:
-            returned_output = original_function(*args, **kwargs)
-        except Exception as error:
-            raise error
-        finally:
-            [logging.getLogger(current_logger).setLevel(all_loggers.get(current_logger))
-             for current_logger in logging.root.manager.loggerDict.keys() if current_logger in list(all_loggers.keys())]
-        return returned_output
+        with suppress_logs():
+            return original_function(*args, **kwargs)
     return wrapper
 
 
@@ -0,0 +1,133 @@
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+# Upper bounds (in seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def get_operation_name(url):
+    """Returns the GraphQL operation name (i.e. UserByScreenName) of a request url, or its path for non-GraphQL urls."""
+    path = urlparse(url).path
+    if "/graphql/" in path:
+        return path.rstrip("/").rsplit("/", 1)[-1]
+    return path or url
+
+
+@dataclass
+class RequestEvent:
+    """Carries data about a single request through the hooks. Timings are in seconds."""
+    operation: str
+    method: str
+    url: str
+    started_at: float = None
+    timings: dict = field(default_factory=dict)
+    status_code: int = None
+    response_bytes: int = 0
+    retries: int = 0
+    rate_limit: dict = None
+    error: Exception = None
+    # Account (hashed auth token) or guest token of the session.
+    scope: str = None
+
+
+class RequestHook:
+    """Base class for metrics/tracing hooks. Override whichever callbacks you need and register the hook with RequestClient.hooks or TweeterPy(hooks=[...])."""
+
+    def before_request(self, event: RequestEvent):
+        pass
+
+    def after_response(self, event: RequestEvent):
+        pass
+
+    def on_error(self, event: RequestEvent):
+        pass
+
+
+class MetricsAggregator(RequestHook):
+    """In-memory aggregator of per-operation request metrics, exportable in Prometheus text format."""
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(sorted(buckets or LATENCY_BUCKETS))
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def _get_stats(self, operation):
+        stats = self._operations.get(operation)
+        if stats is None:
+            stats = {"requests": 0, "errors": 0, "retries": 0, "response_bytes": 0, "status_codes": {},
+                     "latency_buckets": [0] * (len(self.buckets) + 1), "latency_sum": 0.0,
+                     "timings_sum": {}, "rate_limit": None}
+            self._operations[operation] = stats
+        return stats
+
+    def after_response(self, event):
+        total_time = event.timings.get("total", 0.0)
+        with self._lock:
+            stats = self._get_stats(event.operation)
+            stats["requests"] += 1
+            stats["retries"] += event.retries
+            stats["response_bytes"] += event.response_bytes
+            stats["status_codes"][event.status_code] = stats["status_codes"].get(event.status_code, 0) + 1
+            stats["latency_buckets"][bisect_left(self.buckets, total_time)] += 1
+            stats["latency_sum"] += total_time
+            for timing, value in event.timings.items():
+                stats["timings_sum"][timing] = stats["timings_sum"].get(timing, 0.0) + value
+            if event.rate_limit:
+                stats["rate_limit"] = {"limit": event.rate_limit.get("total_limit"),
+                                       "remaining": event.rate_limit.get("remaining_requests_count")}
+
+    def on_error(self, event):
+        with self._lock:
+            self._get_stats(event.operation)["errors"] += 1
+
+    def snapshot(self):
+        """Returns a copy of the collected metrics keyed by operation name."""
+        with self._lock:
+            return {operation: {key: (value.copy() if isinstance(value, (dict, list)) else value) for key, value in stats.items()}
+                    for operation, stats in self._operations.items()}
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+    def to_prometheus(self, prefix="tweeterpy"):
+        """Exports the collected metrics in the Prometheus text exposition format."""
+        # fmt: off - Turns off formatting for this block of code. Just for the readability purpose.
+        lines = []
+        def add_metric(name, metric_type, description, samples):
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            lines.extend(f"{prefix}_{name}{sample}" for sample in samples)
+
+        operations = self.snapshot()
+        add_metric("requests_total", "counter", "Total number of responses received.",
+                   [f'{{operation="{op}",status="{status}"}} {count}' for op, stats in operations.items() for status, count in stats["status_codes"].items()])
+        add_metric("errors_total", "counter", "Total number of failed requests.",
+                   [f'{{operation="{op}"}} {stats["errors"]}' for op, stats in operations.items()])
+        add_metric("retries_total", "counter", "Total number of retried requests.",
+                   [f'{{operation="{op}"}} {stats["retries"]}' for op, stats in operations.items()])
+        add_metric("response_bytes_total", "counter", "Total number of response body bytes received.",
+                   [f'{{operation="{op}"}} {stats["response_bytes"]}' for op, stats in operations.items()])
+        samples = []
+        for op, stats in operations.items():
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + ("+Inf",), stats["latency_buckets"]):
+                cumulative += count
+                samples.append(f'_bucket{{operation="{op}",le="{upper_bound}"}} {cumulative}')
+            samples.append(f'_sum{{operation="{op}"}} {stats["latency_sum"]}')
+            samples.append(f'_count{{operation="{op}"}} {cumulative}')
+        add_metric("request_duration_seconds", "histogram", "Request latency in seconds.", samples)
+        add_metric("request_phase_seconds_total", "counter", "Total time spent per request phase (dns, connect, ttfb, decode) in seconds.",
+                   [f'{{operation="{op}",phase="{phase}"}} {value}' for op, stats in operations.items() for phase, value in stats["timings_sum"].items() if phase != "total"])
+        add_metric("rate_limit_remaining", "gauge", "Remaining API requests in the current rate limit window.",
+                   [f'{{operation="{op}"}} {stats["rate_limit"]["remaining"]}' for op, stats in operations.items() if stats["rate_limit"]])
+        add_metric("rate_limit_total", "gauge", "API requests limit of the current rate limit window.",
+                   [f'{{operation="{op}"}} {stats["rate_limit"]["limit"]}' for op, stats in operations.items() if stats["rate_limit"]])
+        # fmt: on
+        return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    pass
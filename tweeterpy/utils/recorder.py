@@ -0,0 +1,94 @@
+import os
+import re
+import json
+import threading
+from urllib.parse import urlparse, parse_qsl
+from tweeterpy.utils.logging import get_logger
+from tweeterpy.utils.metrics import get_operation_name
+
+logger = get_logger(__name__)
+
+fixture_name_regex = re.compile(r"[^\w.-]+")
+
+
+def get_request_cursor(url, params=None):
+    """Returns the pagination cursor (variables.cursor) of a GraphQL request, None for the first page/other requests."""
+    all_params = dict(parse_qsl(urlparse(url).query))
+    all_params.update(params or {})
+    try:
+        return json.loads(all_params.get("variables") or "{}").get("cursor")
+    except (ValueError, AttributeError):
+        return None
+
+
+def load_fixtures(directory):
+    """Loads the recorded responses of a directory.
+
+    Returns:
+        dict: {(method, operation, cursor): [fixture, ...]} in the recorded order.
+    """
+    fixtures = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        with open(os.path.join(directory, filename), "r", encoding="utf-8") as file:
+            fixture = json.load(file)
+        fixtures.setdefault((fixture["method"], fixture["operation"], fixture.get("cursor")), []).append(fixture)
+    return fixtures
+
+
+class RequestRecorder:
+    """
+        Records the responses of a session (method, url, operation, cursor, status code, content type and body) as JSON fixture files, i.e. to replay them offline with the mock server of the benchmarks.
+        Cookies and request headers are never recorded, but the response bodies may contain personal data.
+    """
+
+    def __init__(self, directory, operations=None):
+        """
+        Args:
+            directory (str): Directory to write the fixtures to.
+            operations (list, optional): Only record these operations (i.e. ["UserTweets", "/"]). If None, records every response. Defaults to None.
+        """
+        self.directory = directory
+        self.operations = set(operations) if operations else None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # Continue the numbering of an existing recording instead of overwriting it.
+        self._count = len([filename for filename in os.listdir(directory) if filename.endswith(".json")])
+
+    def attach(self, session):
+        """Records every (non-streamed) response of the session from now on, including the requests made on the session directly (i.e. during the session bootstrap)."""
+        if getattr(session.request, "_recorder", None) is self:
+            return session
+        send_request = session.request
+
+        def request(method, url, *args, **kwargs):
+            response = send_request(method, url, *args, **kwargs)
+            if not kwargs.get("stream"):
+                try:
+                    self.record(method, url, kwargs.get("params"), response)
+                except Exception as error:
+                    logger.debug("Couldn't record %s. %s", url, error)
+            return response
+        request._recorder = self
+        session.request = request
+        return session
+
+    def record(self, method, url, params, response):
+        operation = get_operation_name(url)
+        if self.operations is not None and operation not in self.operations:
+            return None
+        fixture = {"method": method.upper(), "url": url, "operation": operation, "cursor": get_request_cursor(url, params),
+                   "status_code": response.status_code, "content_type": response.headers.get("Content-Type", ""),
+                   "body": response.text}
+        with self._lock:
+            self._count += 1
+            filename = f"{self._count:04d}-{fixture_name_regex.sub('_', operation).strip('_') or 'root'}.json"
+        filename = os.path.join(self.directory, filename)
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(fixture, file)
+        return filename
+
+
+if __name__ == "__main__":
+    pass
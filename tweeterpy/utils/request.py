@@ -1,55 +1,211 @@
-import bs4
-import logging.config
+import time
+import hashlib
+import logging
+import threading
 from tweeterpy import util
 from urllib.parse import urlparse
-from curl_cffi.requests.session import Session
-from x_client_transaction import ClientTransaction
-from tweeterpy.constants import LOGGING_CONFIG
+from typing import TYPE_CHECKING
+from tweeterpy.utils.logging import get_logger
+from tweeterpy.utils.metrics import RequestEvent, get_operation_name
+from tweeterpy.utils.cache import get_cache_key
 
-logging.config.dictConfig(LOGGING_CONFIG)
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from curl_cffi.requests.session import Session
+
+logger = get_logger(__name__)
+
+# curl timings collected for the request hooks. {CurlInfo name: timing_name}
+CURL_TIMINGS = {"NAMELOOKUP_TIME": "dns",
+                "CONNECT_TIME": "connect",
+                "STARTTRANSFER_TIME": "ttfb"}
+_curl_timings = None
+
+
+def get_curl_timings():
+    """Returns CURL_TIMINGS keyed by the CurlInfo values. curl_cffi is imported on first use."""
+    global _curl_timings
+    if _curl_timings is None:
+        from curl_cffi import CurlInfo
+        _curl_timings = {getattr(CurlInfo, curl_info): timing for curl_info, timing in CURL_TIMINGS.items()}
+    return _curl_timings
 
 
 class RequestClient:
-    def __init__(self, session: Session):
+    def __init__(self, session: "Session", hooks: list = None, cache=None, recorder=None):
+        # RequestRecorder object (see tweeterpy.utils.recorder). Records the responses of the session as fixtures.
+        self.recorder = recorder
         self.session = session
         self.client_transaction = None
+        # util.scan_home_page data of the home page downloaded by the session bootstrap, used once by ApiUpdater.
+        self.home_page_data = None
+        # Timestamp of the guest bootstrap (see tweeterpy.guest.bootstrap_session), None if the session wasn't bootstrapped or is not reusable.
+        self.bootstrapped_at = None
+        # RequestHook objects (see tweeterpy.utils.metrics). No overhead if empty.
+        self.hooks = hooks if hooks is not None else []
+        # ResponseCache object (see tweeterpy.utils.cache). Opt-in.
+        self.cache = cache
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        if getattr(self, "recorder", None) is not None:
+            self.recorder.attach(session)
+        self._session = session
+        self._logged_in = None
+        self._cache_scope = None
+        # Viewer response of the logged in account, cached by TweeterPy.me until the auth state changes.
+        self.viewer = None
+
+    @property
+    def logged_in(self):
+        """Cached auth state. The cookie jar is only checked again after the auth_token cookie changed (see refresh_auth_state)."""
+        if self._logged_in is None:
+            self._logged_in = "auth_token" in self._session.cookies.keys()
+        return self._logged_in
+
+    def refresh_auth_state(self):
+        """Invalidates the cached auth state (and the cached viewer). Call it after modifying the session cookies directly."""
+        self._logged_in = None
+        self._cache_scope = None
+        self.viewer = None
+
+    @property
+    def cache_scope(self):
+        """Separates the cached responses of the different accounts (and the guest sessions)."""
+        if self._cache_scope is None:
+            auth_token = util.get_cookie(self._session.cookies, "auth_token") or ""
+            self._cache_scope = hashlib.sha256(auth_token.encode()).hexdigest()[:16] if auth_token else "guest"
+        return self._cache_scope
 
-    def request(self, url, method=None, skip_error_checking=False, **kwargs):
+    @property
+    def session_scope(self):
+        """Identifies the session in the request events : the account (cache_scope) or the guest token."""
+        if self.logged_in:
+            return self.cache_scope
+        return f"guest-{self._session.headers.get('X-Guest-Token')}"
+
+    @property
+    def last_response_cached(self):
+        """True if the last response returned to the current thread came from the cache."""
+        return getattr(self._local, "cache_hit", False)
+
+    def _handle_response_cookies(self, response):
+        if not response.cookies:
+            return
+        util.sync_csrf_token(self._session, response)
+        if any(cookie.name == "auth_token" for cookie in response.cookies.jar):
+            self.refresh_auth_state()
+
+    def _run_hooks(self, callback_name, event):
+        for hook in self.hooks:
+            try:
+                getattr(hook, callback_name)(event)
+            except Exception as error:
+                logger.debug("Request hook %s failed. %s", hook, error)
+
+    def _enable_curl_timings(self):
+        curl_infos = self.session.curl_infos
+        curl_timings = get_curl_timings()
+        if not all(curl_info in curl_infos for curl_info in curl_timings):
+            curl_infos.extend(curl_info for curl_info in curl_timings if curl_info not in curl_infos)
+
+    def request(self, url, method=None, skip_error_checking=False, _retries=0, **kwargs):
         if method is None:
             method = "GET"
         tid = None
-        logger.debug(f"{locals()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s", locals())
+        # Looked up before generating the transaction id, a cache hit doesn't need one.
+        cache_key = None
+        self._local.cache_hit = False
+        if self.cache is not None and self.cache.is_cacheable(method, url, kwargs.get("params")):
+            cache_key = get_cache_key(method, url, kwargs.get("params"), scope=self.cache_scope)
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                logger.debug("Cache hit : %s", get_operation_name(url))
+                self._local.cache_hit = True
+                return cached_response
+
         headers = kwargs.pop("headers", {})
-        if isinstance(self.client_transaction, ClientTransaction):
+        if self.client_transaction is not None:
             tid = self.client_transaction.generate_transaction_id(
                 method=method, path=urlparse(url).path)
             headers["X-Client-Transaction-Id"] = tid
 
+        event = None
+        if self.hooks:
+            self._enable_curl_timings()
+            event = RequestEvent(operation=get_operation_name(url), method=method, url=url, started_at=time.time(), retries=_retries, scope=self.session_scope)
+            self._run_hooks("before_request", event)
+
         response_text, api_limit_stats = "", {}
         try:
             response = self.session.request(
                 method, url, headers=headers, **kwargs)
             api_limit_stats = util.check_api_rate_limits(response) or {}
+            self._handle_response_cookies(response)
+            if event is not None:
+                event.status_code = response.status_code
+                event.response_bytes = len(response.content)
+                event.rate_limit = api_limit_stats or None
+                event.timings = {timing: response.infos.get(curl_info, 0.0) for curl_info, timing in get_curl_timings().items()}
+                event.timings["total"] = response.elapsed
+            if not _retries and util.is_stale_query(url, response):
+                from tweeterpy.updater import endpoint_healer
+                healed_request = endpoint_healer.heal(self, url, kwargs.get("params"))
+                if healed_request is not None:
+                    if event is not None:
+                        self._run_hooks("after_response", event)
+                    url, kwargs["params"] = healed_request
+                    logger.debug("Retrying with the refreshed endpoint %s.", url)
+                    return self.request(url, method=method, skip_error_checking=skip_error_checking, _retries=_retries + 1, headers=headers, **kwargs)
             if "json" in response.headers.get("Content-Type", ""):
+                decode_start = time.perf_counter()
                 response = response.json()
+                if event is not None:
+                    event.timings["decode"] = time.perf_counter() - decode_start
+                    self._run_hooks("after_response", event)
+                if not _retries and util.is_csrf_token_rejected(response):
+                    logger.debug("csrf token was rejected. Retrying with a new one.")
+                    if util.refresh_csrf_token(self.session, force=True):
+                        return self.request(url, method=method, skip_error_checking=skip_error_checking, _retries=_retries + 1, headers=headers, **kwargs)
+                    logger.warn("Couldn't get a new csrf token.")
+                if cache_key is not None and isinstance(response, dict) and not response.get("errors") and "error" not in response:
+                    self.cache.set(cache_key, response, self.cache.get_ttl(url, kwargs.get("params")))
                 if api_limit_stats:
                     response.update({"api_rate_limit": api_limit_stats})
                 if skip_error_checking:
                     return response
                 return util.check_for_errors(response)
+            import bs4
+            decode_start = time.perf_counter()
             soup = bs4.BeautifulSoup(response.content, "lxml")
-            response_text = "\n".join(
-                [line.strip() for line in soup.text.split("\n") if line.strip()])
+            if not response.ok:
+                response_text = "\n".join(
+                    [line.strip() for line in soup.text.split("\n") if line.strip()])
+            if event is not None:
+                event.timings["decode"] = time.perf_counter() - decode_start
+                self._run_hooks("after_response", event)
             response.raise_for_status()
             return soup
-        except KeyboardInterrupt:
+        except KeyboardInterrupt as error:
+            # Lets the hooks release what before_request acquired (i.e. AdaptiveConcurrencyLimiter's slot).
+            if event is not None:
+                event.error = error
+                self._run_hooks("on_error", event)
             logger.warn("Keyboard Interruption...")
             return
         except Exception as error:
-            logger.exception(f"{error}\n{response_text}\n")
+            if event is not None:
+                event.error = error
+                self._run_hooks("on_error", event)
+            logger.exception("%s\n%s\n", error, response_text)
             if api_limit_stats.get('rate_limit_exhausted'):
-                logger.error(f"Rate Limit Exceeded => {api_limit_stats}")
+                logger.error("Rate Limit Exceeded => %s", api_limit_stats)
                 raise util.RateLimitError('API Rate Limit Exceeded.')
             raise error
 
@@ -1,11 +1,12 @@
 import os
+import time
 import pickle
-import logging.config
-from curl_cffi.requests.session import Session
-from tweeterpy.constants import DEFAULT_SESSION_DIRECTORY, LOGGING_CONFIG
+import sqlite3
+import threading
+from tweeterpy.utils.logging import get_logger
+from tweeterpy.constants import DEFAULT_SESSION_DIRECTORY, DEFAULT_SESSION_STORE
 
-logging.config.dictConfig(LOGGING_CONFIG)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 def _create_session_directory(directory_path=None):
@@ -33,12 +34,48 @@ def _show_saved_sessions(directory_path=None):
     return file_path
 
 
-def save_session(filename=None, path=None, session=None):
+def _new_session():
+    # curl_cffi is imported on first use to keep the import of this module cheap.
+    from curl_cffi.requests.session import Session
+    return Session(impersonate="chrome")
+
+
+def _check_session(session):
+    from curl_cffi.requests.session import Session
     if session is None:
         raise NameError("name 'session' is not defined.")
     if not isinstance(session, Session):
         raise TypeError(
             f"Invalid session type. {session} is not a requests.Session Object...")
+
+
+def _dump_headers(session):
+    return pickle.dumps(session.headers.multi_items(), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _dump_cookies(session):
+    # Cookie objects are picklable, the cookie jar itself (holds a lock) is not.
+    return pickle.dumps(list(session.cookies.jar), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _restore_session(session, headers, cookies):
+    if isinstance(headers, list):
+        session.headers.clear()
+        for key, value in headers:
+            session.headers[key] = value
+    else:
+        session.headers = headers
+    if isinstance(cookies, list):
+        session.cookies.clear()
+        for cookie in cookies:
+            session.cookies.jar.set_cookie(cookie)
+    else:
+        session.cookies = cookies
+    return session
+
+
+def save_session(filename=None, path=None, session=None):
+    _check_session(session)
     if filename is None:
         filename = str(
             input("Enter Username/Account Name to Save the Session : ")).strip()
@@ -47,23 +84,143 @@ def save_session(filename=None, path=None, session=None):
     filename = f"{filename}.pkl"
     file_path = os.path.join(path, filename)
     with open(file_path, "wb") as file:
-        pickle.dump([session.headers, session.cookies], file)
+        pickle.dump([session.headers.multi_items(), list(session.cookies.jar)], file)
     return file_path
 
 
 def load_session(path=None, session=None):
-    if session is None:
-        raise NameError("name 'session' is not defined.")
-    if not isinstance(session, Session):
-        raise TypeError(
-            f"Invalid session type. {session} is not a requests.Session Object...")
+    _check_session(session)
     if path is None:
         path = _show_saved_sessions()
     with open(path, "rb") as file:
         headers, cookies = pickle.load(file)
-    session.headers = headers
-    session.cookies = cookies
-    return session
+    return _restore_session(session, headers, cookies)
+
+
+class SessionStore:
+    """
+        Non-interactive store keeping the sessions (headers and cookies) of many accounts in a single indexed SQLite file.
+        Sessions can be loaded in bulk with one query (load_all) or lazily per account (load). Writes are atomic transactions, so cookie rotations (update_cookies) never leave a half written session behind.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.path.join(_create_session_directory(), DEFAULT_SESSION_STORE)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (name TEXT PRIMARY KEY, headers BLOB NOT NULL, cookies BLOB NOT NULL, updated_at REAL NOT NULL)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __contains__(self, name):
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM sessions WHERE name = ?", (name,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def names(self):
+        """Returns the names of all the saved sessions."""
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT name FROM sessions ORDER BY name")]
+
+    def save(self, name, session):
+        """Saves (or replaces) a session under the given name."""
+        self.save_many({name: session})
+
+    def save_many(self, sessions):
+        """Saves multiple sessions in a single transaction.
+
+        Args:
+            sessions (dict): {name: session}
+        """
+        # fmt: off
+        rows = [(name, _dump_headers(session), _dump_cookies(session), time.time()) for name, session in sessions.items()]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO sessions (name, headers, cookies, updated_at) VALUES (?, ?, ?, ?)", rows)
+        # fmt: on
+
+    def update_cookies(self, name, session):
+        """Atomically replaces the cookies of an already saved session, i.e. after the cookies have been rotated."""
+        with self._lock, self._connection:
+            cursor = self._connection.execute("UPDATE sessions SET cookies = ?, updated_at = ? WHERE name = ?",
+                                              (_dump_cookies(session), time.time(), name))
+        if not cursor.rowcount:
+            raise KeyError(name)
+
+    def load(self, name, session=None):
+        """Loads a single saved session.
+
+        Args:
+            name (str): Session name.
+            session (Session, optional): Session object to load the saved headers and cookies into. If None, creates a new one. Defaults to None.
+
+        Returns:
+            Session: Restored session.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT headers, cookies FROM sessions WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        if session is None:
+            session = _new_session()
+        return _restore_session(session, pickle.loads(row[0]), pickle.loads(row[1]))
+
+    def load_all(self, names=None):
+        """Loads all (or the given) saved sessions in a single query.
+
+        Args:
+            names (list, optional): Session names to load. If None, loads all saved sessions. Defaults to None.
+
+        Returns:
+            dict: {name: Session}
+        """
+        with self._lock:
+            if names is None:
+                rows = self._connection.execute("SELECT name, headers, cookies FROM sessions").fetchall()
+            else:
+                names = list(names)
+                placeholders = ",".join("?" * len(names))
+                rows = self._connection.execute(f"SELECT name, headers, cookies FROM sessions WHERE name IN ({placeholders})", names).fetchall()
+        return {name: _restore_session(_new_session(), pickle.loads(headers), pickle.loads(cookies)) for name, headers, cookies in rows}
+
+    def delete(self, name):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM sessions WHERE name = ?", (name,))
+
+    def import_directory(self, directory_path=None):
+        """Imports the session files (.pkl) saved with save_session into the store.
+
+        Args:
+            directory_path (str, optional): Directory of the session files. Defaults to DEFAULT_SESSION_DIRECTORY.
+
+        Returns:
+            list: Imported session names.
+        """
+        directory_path = _create_session_directory(directory_path)
+        sessions = {}
+        for file in os.listdir(directory_path):
+            if not file.endswith(".pkl"):
+                continue
+            try:
+                sessions[os.path.splitext(file)[0]] = load_session(path=os.path.join(directory_path, file), session=_new_session())
+            except Exception as error:
+                logger.warn("Couldn't import the session file %s. %s", file, error)
+        self.save_many(sessions)
+        return list(sessions.keys())
 
 
 if __name__ == "__main__":